@@ -0,0 +1,163 @@
+"""
+Global actor interning for the "Author and People Metrics" table.
+
+Every login appearing as PR author, commit author, committer, reviewer,
+commenter or timeline actor is mapped to one integer id from a shared,
+sorted vocabulary. Each role is then a sorted array of ids, and distinct
+counts and cross-role overlaps (e.g. reviewers who are also commit authors)
+come from packed bitsets instead of repeated Python `set` construction.
+
+Usage:
+    python actor_index.py                    # counts + overlap matrix
+    python actor_index.py --save build/actors
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from aidev_data import ACTOR_ROLES, iter_batches, table_path
+
+
+def login_values(values: pd.Series) -> pd.Series:
+    """Normalize a login column; nested user structs are reduced to their `login`."""
+    if values.dtype == object and values.map(lambda v: isinstance(v, dict)).any():
+        values = values.map(lambda v: v.get("login") if isinstance(v, dict) else v)
+    return values.dropna().astype(str)
+
+
+def _unique_logins(table: str, column: str, base: str | None = None) -> np.ndarray:
+    """Distinct logins of one column, read chunk by chunk."""
+    parts = [pd.unique(login_values(chunk[column]))
+             for chunk in iter_batches(table_path(table, base), columns=[column])]
+    if not parts:
+        return np.empty(0, dtype=object)
+    return pd.unique(np.concatenate(parts))
+
+
+def _popcount(words: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words).sum())
+
+
+class ActorIndex:
+    """Sorted login vocabulary plus one sorted id array per role."""
+
+    def __init__(self, vocabulary: np.ndarray, roles: dict[str, np.ndarray]) -> None:
+        self.vocabulary = vocabulary
+        self.roles = roles
+        self._bitsets: dict[str, np.ndarray] | None = None
+
+    # --- construction --------------------------------------------------------
+    @classmethod
+    def from_logins(cls, role_logins: dict[str, Iterable[str]]) -> "ActorIndex":
+        """Intern already-extracted logins per role."""
+        uniques = {role: pd.unique(np.asarray(list(logins), dtype=object))
+                   for role, logins in role_logins.items()}
+        non_empty = [u for u in uniques.values() if len(u)]
+        vocabulary = np.sort(pd.unique(np.concatenate(non_empty))) if non_empty \
+            else np.empty(0, dtype=object)
+        roles = {role: np.sort(np.searchsorted(vocabulary, u).astype(np.int32))
+                 for role, u in uniques.items()}
+        return cls(vocabulary, roles)
+
+    @classmethod
+    def from_tables(cls, roles: dict[str, tuple[str, str]] | None = None,
+                    base: str | None = None) -> "ActorIndex":
+        """Stream each role's login column and intern the union."""
+        roles = roles or ACTOR_ROLES
+        cache: dict[tuple[str, str], np.ndarray] = {}
+        logins = {}
+        for role, key in roles.items():
+            if key not in cache:
+                cache[key] = _unique_logins(*key, base=base)
+            logins[role] = cache[key]
+        return cls.from_logins(logins)
+
+    @classmethod
+    def from_frames(cls, frames: dict[str, pd.DataFrame],
+                    roles: dict[str, tuple[str, str]] | None = None) -> "ActorIndex":
+        """Intern logins from in-memory tables keyed by table name."""
+        roles = roles or ACTOR_ROLES
+        return cls.from_logins({role: login_values(frames[table][column])
+                                for role, (table, column) in roles.items()
+                                if table in frames and column in frames[table].columns})
+
+    # --- lookups -------------------------------------------------------------
+    def encode(self, logins: pd.Series) -> np.ndarray:
+        """Map logins to global ids; unknown or missing logins become -1."""
+        return pd.Index(self.vocabulary).get_indexer(logins.astype(object)).astype(np.int32)
+
+    def decode(self, ids: np.ndarray) -> np.ndarray:
+        return self.vocabulary[ids]
+
+    def role_counts(self) -> pd.Series:
+        """Distinct actors per role."""
+        return pd.Series({role: int(ids.size) for role, ids in self.roles.items()},
+                         name="unique_count")
+
+    def _role_bitsets(self) -> dict[str, np.ndarray]:
+        if self._bitsets is None:
+            n = len(self.vocabulary)
+            self._bitsets = {}
+            for role, ids in self.roles.items():
+                member = np.zeros(n, dtype=bool)
+                member[ids] = True
+                self._bitsets[role] = np.packbits(member)
+        return self._bitsets
+
+    def overlap_matrix(self) -> pd.DataFrame:
+        """Actors shared by each pair of roles; the diagonal is the role size."""
+        bits = self._role_bitsets()
+        names = list(self.roles)
+        out = np.zeros((len(names), len(names)), dtype=np.int64)
+        for i, a in enumerate(names):
+            for j in range(i, len(names)):
+                out[i, j] = out[j, i] = _popcount(bits[a] & bits[names[j]])
+        return pd.DataFrame(out, index=names, columns=names)
+
+    def overlap_share(self) -> pd.DataFrame:
+        """Row-normalized overlap: share of row-role actors who also act in the column role."""
+        matrix = self.overlap_matrix()
+        return matrix.div(np.diag(matrix).clip(min=1), axis=0)
+
+    # --- persistence ---------------------------------------------------------
+    def save(self, directory: str | Path) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({"id": np.arange(len(self.vocabulary), dtype=np.int32),
+                      "login": self.vocabulary}).to_parquet(directory / "actors.parquet", index=False)
+        np.savez_compressed(directory / "roles.npz", **{role: ids for role, ids in self.roles.items()})
+
+    @classmethod
+    def load(cls, directory: str | Path) -> "ActorIndex":
+        directory = Path(directory)
+        vocabulary = pd.read_parquet(directory / "actors.parquet")["login"].to_numpy(dtype=object)
+        with np.load(directory / "roles.npz") as npz:
+            roles = {role: npz[role] for role in npz.files}
+        return cls(vocabulary, roles)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save", type=Path, help="directory to persist the index to")
+    args = parser.parse_args(argv)
+
+    index = ActorIndex.from_tables()
+    print(f"{len(index.vocabulary):,} distinct actors across all roles\n")
+    print(index.role_counts().to_string())
+    print("\nCross-role overlap (actors in both roles):")
+    print(index.overlap_matrix().to_string())
+    if args.save:
+        index.save(args.save)
+        print("Wrote", args.save)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""
+Shared locations and loaders for the AIDev parquet tables.
+
+Every script and notebook reads the same Hugging Face files; this module keeps
+the paths in one place and adds a batch reader so that the full-scale `all_*`
+tables can be streamed instead of loaded whole.
+
+pandas and pyarrow are imported inside the functions that need them, so that
+cheap callers (listing tables, checking freshness) stay fast to start.
+
+Preview mode: set AIDEV_SAMPLE to a fraction (e.g. 0.05) and `load_table`
+returns a reproducible sample of PRs stratified by agent, together with only
+the commits, comments, reviews, timeline rows, repositories, users and issues
+those PRs reference. AIDEV_SAMPLE_SPREAD=repo_url additionally spreads each
+agent's sample evenly over repositories, AIDEV_SAMPLE_SEED picks another
+sample. `iter_batches` / `table_path` are not affected; to run the streaming
+tools on a sample, write one out and point AIDEV_DATA_DIR at it:
+    python aidev_data.py sample --fraction 0.05 --out ../data/sample_5pct
+
+Memory: AIDEV_COMPACT=1 (or `load_table(..., compact=True)`) loads tables with
+narrow numeric types, categorical repeated strings and Arrow text, and
+AIDEV_MEMORY_BUDGET=2GB bounds what they may hold (see compact_schema.py).
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Sequence
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# =============================================================================
+# Dataset locations
+# =============================================================================
+HF_BASE = "hf://datasets/hao-li/AIDev"
+
+# Set AIDEV_DATA_DIR to a directory holding local copies of the parquet files
+# to avoid re-downloading them on every run.
+DATA_BASE = os.environ.get("AIDEV_DATA_DIR", HF_BASE)
+
+TABLES = [
+    # Basic
+    "pull_request",
+    "repository",
+    "user",
+    # Comments and reviews
+    "pr_comments",
+    "pr_reviews",
+    "pr_review_comments",
+    # Commits
+    "pr_commits",
+    "pr_commit_details",
+    # Related issues
+    "related_issue",
+    "issue",
+    # Events
+    "pr_timeline",
+    # Task type
+    "pr_task_type",
+    # Human-PR
+    "human_pull_request",
+    "human_pr_task_type",
+    # Full-scale (all repositories)
+    "all_pull_request",
+    "all_repository",
+    "all_user",
+]
+
+# "Author and People Metrics" roles: label -> (table, login column); see
+# actor_index.py. Kept here so the build graph can list its sources without
+# importing pandas.
+ACTOR_ROLES = {
+    "PR Authors": ("pull_request", "user"),
+    "Commit Authors": ("pr_commits", "author"),
+    "Commit Committers": ("pr_commits", "committer"),
+    "Reviewers": ("pr_reviews", "user"),
+    "Commenters": ("pr_comments", "user"),
+    "Timeline Actors": ("pr_timeline", "actor"),
+}
+
+
+def table_path(name: str, base: str | None = None) -> str:
+    """Return the parquet location of table *name* under *base*."""
+    return f"{(base or DATA_BASE).rstrip('/')}/{name}.parquet"
+
+
+# Set AIDEV_COMPACT=1 to load every table with the compact dtypes declared in
+# compact_schema.py (and under AIDEV_MEMORY_BUDGET, if set).
+COMPACT = os.environ.get("AIDEV_COMPACT", "0") not in ("", "0")
+
+
+def load_table(name: str,
+               columns: Sequence[str] | None = None,
+               base: str | None = None,
+               compact: bool | None = None) -> pd.DataFrame:
+    """
+    Load one AIDev table, optionally restricted to *columns*.
+
+    In preview mode (see `set_sample`) only the rows belonging to the sampled
+    PRs are returned. With *compact* (default: AIDEV_COMPACT) the columns get
+    their compact dtypes and the table counts against the memory budget, see
+    compact_schema.py.
+    """
+    if SAMPLE is not None and name in SAMPLE_ROOTS | SAMPLE_LINKS.keys():
+        frame = _load_sampled(name, columns, base, SAMPLE)
+    else:
+        frame = _read(name, columns, base)
+    if COMPACT if compact is None else compact:
+        import compact_schema
+
+        frame = compact_schema.admit(name, compact_schema.compact(frame, name))
+    return frame
+
+
+def _read(name: str, columns: Sequence[str] | None, base: str | None,
+          filters: list | None = None) -> pd.DataFrame:
+    import pandas as pd
+
+    return pd.read_parquet(table_path(name, base),
+                           columns=list(columns) if columns else None, filters=filters)
+
+
+def open_parquet(path: str):
+    """Open *path* (local or any fsspec URL) as a `pyarrow.parquet.ParquetFile`."""
+    import pyarrow.parquet as pq
+
+    if "://" not in path:
+        return pq.ParquetFile(path)
+    import fsspec
+
+    return pq.ParquetFile(fsspec.open(path, "rb").open())
+
+
+def iter_batches(path: str,
+                 columns: Sequence[str] | None = None,
+                 batch_size: int = 65_536,
+                 row_groups: Sequence[int] | None = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream a parquet file as DataFrame chunks of at most *batch_size* rows.
+
+    Args:
+        path: Local path or fsspec URL (see `table_path`).
+        columns: Columns to read; all columns when None.
+        batch_size: Maximum rows per yielded chunk.
+        row_groups: Restrict reading to these row groups (used to split a
+            file across worker processes).
+    """
+    pf = open_parquet(path)
+    batches = pf.iter_batches(batch_size=batch_size,
+                              columns=list(columns) if columns else None,
+                              row_groups=list(row_groups) if row_groups is not None else None)
+    for batch in batches:
+        yield batch.to_pandas()
+
+
+# Remote fingerprints cost one hub request per table, so they are cached on
+# disk for AIDEV_FINGERPRINT_TTL seconds (0 asks the hub every time). A table
+# republished within that window is still seen as unchanged.
+FINGERPRINT_TTL = float(os.environ.get("AIDEV_FINGERPRINT_TTL", "600"))
+FINGERPRINT_CACHE = Path(os.environ.get("AIDEV_FINGERPRINT_CACHE",
+                                        Path.home() / ".cache" / "aidev" / "fingerprints.json"))
+
+
+def source_fingerprint(path: str) -> str:
+    """
+    Cheap change marker for a table location.
+
+    Local files use size and modification time; remote files (hf://) use the
+    blob hash / etag the hub reports, so nothing is downloaded, and are reused
+    from FINGERPRINT_CACHE while younger than FINGERPRINT_TTL.
+    """
+    if "://" not in path:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return "missing"
+        return f"{st.st_size}-{st.st_mtime_ns}"
+    try:
+        cache = json.loads(FINGERPRINT_CACHE.read_text())
+    except (FileNotFoundError, ValueError):
+        cache = {}
+    checked, fingerprint = cache.get(path, (0.0, None))
+    if fingerprint is not None and time.time() - checked < FINGERPRINT_TTL:
+        return fingerprint
+    fingerprint = _remote_fingerprint(path)
+    cache[path] = (time.time(), fingerprint)
+    try:
+        FINGERPRINT_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        FINGERPRINT_CACHE.write_text(json.dumps(cache, indent=1, sort_keys=True))
+    except OSError:
+        pass  # read-only home: fall back to asking the hub every time
+    return fingerprint
+
+
+def _remote_fingerprint(path: str) -> str:
+    import fsspec
+
+    fs, _, (resolved,) = fsspec.get_fs_token_paths(path)
+    info = fs.info(resolved)
+    fingerprint = {k: info.get(k) for k in ("sha", "etag", "ETag", "size", "last_commit")
+                   if info.get(k) is not None}
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# =============================================================================
+# Preview sampling
+# =============================================================================
+@dataclass(frozen=True)
+class SampleSpec:
+    """
+    A reproducible, agent-stratified PR sample.
+
+    Args:
+        fraction: Share of PRs kept in every stratum.
+        by: Stratum columns; each stratum keeps max(min_per_stratum,
+            round(fraction * size)) PRs.
+        spread: Optional column (e.g. "repo_url") over which each stratum's
+            picks are spread evenly (systematic sampling), so that large
+            repositories do not crowd out small ones by chance.
+        seed: Changes which PRs are picked, not how many.
+    """
+    fraction: float
+    by: tuple[str, ...] = ("agent",)
+    spread: str | None = None
+    seed: int = 0
+    min_per_stratum: int = 1
+
+
+# tables sampled directly by PR; every other table follows its references
+SAMPLE_ROOTS = {"pull_request", "human_pull_request", "all_pull_request"}
+
+# table -> candidate links (column, parent table, parent column); the first
+# link whose columns exist in both tables is used
+SAMPLE_LINKS: dict[str, list[tuple[str, str, str]]] = {
+    **{child: [("pr_id", "pull_request", "id")]
+       for child in ("pr_comments", "pr_reviews", "pr_review_comments", "pr_commits",
+                     "pr_commit_details", "pr_timeline", "related_issue")},
+    "pr_task_type": [("id", "pull_request", "id")],
+    "issue": [("id", "related_issue", "issue_id")],
+    "repository": [("id", "pull_request", "repo_id"), ("url", "pull_request", "repo_url")],
+    "user": [("id", "pull_request", "user_id"), ("login", "pull_request", "user")],
+    "human_pr_task_type": [("id", "human_pull_request", "id")],
+    "all_repository": [("id", "all_pull_request", "repo_id"), ("url", "all_pull_request", "repo_url")],
+    "all_user": [("id", "all_pull_request", "user_id"), ("login", "all_pull_request", "user")],
+}
+
+
+def _sample_from_env() -> SampleSpec | None:
+    fraction = os.environ.get("AIDEV_SAMPLE")
+    if not fraction:
+        return None
+    return SampleSpec(float(fraction), spread=os.environ.get("AIDEV_SAMPLE_SPREAD") or None,
+                      seed=int(os.environ.get("AIDEV_SAMPLE_SEED", "0")))
+
+
+SAMPLE: SampleSpec | None = _sample_from_env()
+
+
+def set_sample(spec: SampleSpec | float | None) -> None:
+    """Switch preview mode on (a spec or a plain fraction) or off (None)."""
+    global SAMPLE
+    SAMPLE = SampleSpec(spec) if isinstance(spec, (int, float)) else spec
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_names(path: str) -> frozenset[str]:
+    return frozenset(open_parquet(path).schema_arrow.names)
+
+
+def stratified_sample(frame: pd.DataFrame, spec: SampleSpec, key: str = "id") -> pd.Series:
+    """
+    Boolean mask selecting *spec*'s sample of *frame*'s rows.
+
+    Rows are ordered within each stratum by (spread value, seeded hash of
+    *key*) and every (1 / fraction)-th row is kept from a seeded offset, which
+    gives exactly the stratum's quota, evenly spread over the spread column.
+    """
+    import numpy as np
+    import pandas as pd
+
+    n = len(frame)
+    strata = (frame.groupby(list(spec.by), sort=False, observed=True, dropna=False).ngroup()
+              .to_numpy(dtype=np.int64) if spec.by else np.zeros(n, dtype=np.int64))
+    rank = pd.util.hash_array(frame[key].to_numpy(), hash_key=f"aidev{spec.seed:012d}")
+    order_keys = [rank]
+    if spec.spread:
+        order_keys.append(pd.factorize(frame[spec.spread])[0])
+    order = np.lexsort((*order_keys, strata))
+
+    sizes = np.bincount(strata, minlength=strata.max() + 1 if n else 0)
+    quota = np.minimum(sizes, np.maximum(spec.min_per_stratum,
+                                         np.rint(sizes * spec.fraction))).astype(np.int64)
+    offset = (np.random.default_rng(spec.seed).random(sizes.size) * sizes).astype(np.int64)
+    sorted_strata = strata[order]
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    position = np.arange(n) - starts[sorted_strata]
+    size = sizes[sorted_strata]
+    # systematic pick: exactly quota[s] of the size[s] positions satisfy this
+    picked = (position * quota[sorted_strata] + offset[sorted_strata]) % np.maximum(size, 1) \
+        >= size - quota[sorted_strata]
+    mask = np.zeros(n, dtype=bool)
+    mask[order[picked]] = True
+    return pd.Series(mask, index=frame.index)
+
+
+@functools.lru_cache(maxsize=32)
+def _sample_values(name: str, column: str, base: str | None, spec: SampleSpec) -> tuple:
+    """Distinct values of *column* over the sampled rows of table *name*."""
+    if name in SAMPLE_ROOTS:
+        key_columns = list(dict.fromkeys(["id", *spec.by, *([spec.spread] if spec.spread else []),
+                                          column]))
+        frame = _read(name, key_columns, base)
+        values = frame.loc[stratified_sample(frame, spec), column]
+    else:
+        values = _load_sampled(name, [column], base, spec)[column]
+    return tuple(values.dropna().unique().tolist())
+
+
+def _load_sampled(name: str, columns: Sequence[str] | None, base: str | None,
+                  spec: SampleSpec) -> pd.DataFrame:
+    if name in SAMPLE_ROOTS:
+        return _read_matching(name, columns, base, "id", _sample_values(name, "id", base, spec))
+    names = _schema_names(table_path(name, base))
+    for column, parent, parent_column in SAMPLE_LINKS[name]:
+        if column in names and parent_column in _schema_names(table_path(parent, base)):
+            break
+    else:
+        raise KeyError(f"no sampling link for table {name!r}")
+    return _read_matching(name, columns, base, column,
+                          _sample_values(parent, parent_column, base, spec))
+
+
+def _read_matching(name: str, columns: Sequence[str] | None, base: str | None,
+                   column: str, values: tuple) -> pd.DataFrame:
+    if values:
+        return _read(name, columns, base, filters=[(column, "in", list(values))])
+    # an empty value set cannot be typed for the filter; return the empty schema
+    empty = open_parquet(table_path(name, base)).schema_arrow.empty_table().to_pandas()
+    return empty[list(columns)] if columns else empty
+
+
+def write_sample(out: str | Path, spec: SampleSpec, tables: Sequence[str] = TABLES,
+                 base: str | None = None) -> dict[str, int]:
+    """Write the sampled version of *tables* as local parquet files under *out*."""
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    rows = {}
+    for name in tables:
+        frame = _load_sampled(name, None, base, spec) if name in SAMPLE_ROOTS | SAMPLE_LINKS.keys() \
+            else _read(name, None, base)
+        frame.to_parquet(out / f"{name}.parquet", index=False)
+        rows[name] = len(frame)
+        print(f"✓ {name:<22} {len(frame):>10,} rows")
+    (out / "sample.json").write_text(json.dumps(spec.__dict__, indent=2))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sample = sub.add_parser("sample", help="write a stratified sample of every table")
+    sample.add_argument("--fraction", type=float, required=True)
+    sample.add_argument("--spread", help="column to spread picks over, e.g. repo_url")
+    sample.add_argument("--seed", type=int, default=0)
+    sample.add_argument("--table", action="append", help="only these tables (repeatable)")
+    sample.add_argument("--out", type=Path, required=True)
+    args = parser.parse_args(argv)
+
+    spec = SampleSpec(args.fraction, spread=args.spread, seed=args.seed)
+    write_sample(args.out, spec, args.table or [t for t in TABLES if not t.startswith("all_")])
+    print("Wrote", args.out)
+
+
+if __name__ == "__main__":
+    main()
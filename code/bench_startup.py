@@ -0,0 +1,92 @@
+"""
+Startup-time benchmark for the figure scripts, based on `python -X importtime`.
+
+Each script is run in a fresh interpreter (from latex/, like the report
+build) and the report shows wall time, the time spent importing, the
+slowest top-level imports and whether any heavy library was loaded. The
+default invocation is `--check`, the same path as a "nothing changed" run
+minus rendering.
+
+Usage:
+    python bench_startup.py
+    python bench_startup.py --repeat 5 --budget 0.5
+    python bench_startup.py --script regenerate_individual_figures.py --args "--list"
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CODE_DIR = Path(__file__).resolve().parent
+LATEX_DIR = CODE_DIR.parent / "latex"
+
+FIGURE_SCRIPTS = ["regenerate_individual_figures.py", "generate_entity_distribution_figures.py"]
+HEAVY_MODULES = ["numpy", "pandas", "pyarrow", "matplotlib", "seaborn"]
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """(module, self_us, cumulative_us, depth) for every `-X importtime` line."""
+    rows = []
+    for line in stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m:
+            depth = (len(m.group(3)) - 1) // 2
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), depth))
+    return rows
+
+
+def run_once(script: str, args: list[str], cwd: Path) -> tuple[float, list, int]:
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", str(CODE_DIR / script), *args],
+                          cwd=cwd, capture_output=True, text=True)
+    return time.perf_counter() - start, parse_importtime(proc.stderr), proc.returncode
+
+
+def report(script: str, args: list[str], *, repeat: int, top: int, cwd: Path) -> float:
+    runs = [run_once(script, args, cwd) for _ in range(repeat)]
+    wall = statistics.median(r[0] for r in runs)
+    rows = runs[-1][1]
+    top_level = [r for r in rows if r[3] == 0]
+    imported = {r[0] for r in rows}
+    print(f"{script} {' '.join(args)}")
+    print(f"  wall time (median of {repeat}): {wall * 1000:8.1f} ms   exit status {runs[-1][2]}")
+    print(f"  import time:                 {sum(r[2] for r in top_level) / 1000:8.1f} ms "
+          f"({len(rows)} modules)")
+    for name, _, cumulative, _ in sorted(top_level, key=lambda r: -r[2])[:top]:
+        print(f"    {cumulative / 1000:8.1f} ms  {name}")
+    loaded = [m for m in HEAVY_MODULES if m in imported]
+    print(f"  heavy modules loaded: {', '.join(loaded) if loaded else 'none'}")
+    return wall
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--script", action="append", help="script to time (repeatable)")
+    parser.add_argument("--args", default="--check", help="arguments passed to each script")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="slowest top-level imports to show")
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="exit with status 1 if any median wall time exceeds this (seconds)")
+    args = parser.parse_args(argv)
+
+    cwd = LATEX_DIR if LATEX_DIR.is_dir() else Path.cwd()
+    walls = [report(script, shlex.split(args.args), repeat=args.repeat, top=args.top, cwd=cwd)
+             for script in args.script or FIGURE_SCRIPTS]
+    slowest = max(walls)
+    print(f"\n{'✓' if slowest <= args.budget else '✗'} slowest startup {slowest:.2f}s "
+          f"(budget {args.budget:.2f}s)")
+    if slowest > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,586 @@
+"""
+Incremental, parallel build of the LaTeX report: data -> metrics -> tables -> figures -> PDF.
+
+Each artifact is a `Node` with declared dependencies (other nodes), sources
+(files or dataset URLs whose content decides freshness) and outputs. A node
+is skipped when the hash of its sources and of its dependencies' keys matches
+the one recorded after its last successful run and all its outputs exist.
+Independent nodes run concurrently.
+
+The metric nodes write JSON under `build/metrics/`; the `tables` node turns
+them into `latex/tables/*.tex`, which `report.tex` pulls in with `\\input`,
+plus `latex/tables/macros.tex` with the numbers quoted in the prose. These
+files are build outputs and are not committed. The figure nodes declare every
+figure their script registers; the notebook figures under `latex/figures/`
+cannot be rebuilt here and are only checked and hashed.
+
+Usage:
+    python build_report.py                 # build everything that is stale
+    python build_report.py tables -j 4     # only the tables and what they need
+    python build_report.py --list
+    python build_report.py --dry-run
+    python build_report.py --force report
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib
+import json
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from aidev_data import ACTOR_ROLES, source_fingerprint, table_path
+
+CODE_DIR = Path(__file__).resolve().parent
+ROOT_DIR = CODE_DIR.parent
+LATEX_DIR = ROOT_DIR / "latex"
+TABLES_DIR = LATEX_DIR / "tables"
+BUILD_DIR = ROOT_DIR / "build"
+METRICS_DIR = BUILD_DIR / "metrics"
+STATE_FILE = BUILD_DIR / "state.json"
+
+
+# =============================================================================
+# Graph model
+# =============================================================================
+@dataclass(frozen=True)
+class Node:
+    """One build artifact and the recipe that produces it."""
+    name: str
+    action: Callable[[], None]
+    deps: tuple[str, ...] = ()
+    sources: tuple[str, ...] = ()  # local paths or dataset URLs
+    outputs: tuple[Path, ...] = ()
+    description: str = ""
+
+
+@dataclass
+class BuildResult:
+    ran: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def source_digest(source: str) -> str:
+    """Content digest of a local file, or the remote fingerprint of a dataset URL."""
+    if "://" not in source:
+        path = Path(source)
+        return _file_digest(path) if path.exists() else "missing"
+    return source_fingerprint(source)
+
+
+class ReportGraph:
+    """Dependency graph with hash-based freshness and a parallel scheduler."""
+
+    def __init__(self, nodes: list[Node], state_file: Path = STATE_FILE) -> None:
+        self.nodes = {node.name: node for node in nodes}
+        for node in nodes:
+            unknown = set(node.deps) - set(self.nodes)
+            if unknown:
+                raise ValueError(f"{node.name}: unknown dependencies {sorted(unknown)}")
+        self.state_file = state_file
+        self._digests: dict[str, str] = {}
+
+    # --- graph helpers -------------------------------------------------------
+    def closure(self, targets: list[str] | None) -> list[str]:
+        """Targets plus everything they depend on, in topological order."""
+        order: list[str] = []
+        visiting: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"dependency cycle through {name}")
+            if name not in self.nodes:
+                raise KeyError(f"unknown target {name!r}; use --list")
+            visiting.add(name)
+            for dep in self.nodes[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in targets or list(self.nodes):
+            visit(name)
+        return order
+
+    # --- freshness -----------------------------------------------------------
+    def _digest(self, source: str) -> str:
+        if source not in self._digests:
+            self._digests[source] = source_digest(source)
+        return self._digests[source]
+
+    def node_key(self, name: str, keys: dict[str, str]) -> str:
+        node = self.nodes[name]
+        h = hashlib.sha256(name.encode())
+        for source in node.sources:
+            h.update(f"{source}={self._digest(source)}".encode())
+        for dep in node.deps:
+            h.update(f"{dep}={keys[dep]}".encode())
+        return h.hexdigest()
+
+    def _load_state(self) -> dict[str, str]:
+        if self.state_file.exists():
+            return json.loads(self.state_file.read_text())
+        return {}
+
+    def _save_state(self, state: dict[str, str]) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self.state_file.write_text(json.dumps(state, indent=2, sort_keys=True))
+
+    # --- execution -----------------------------------------------------------
+    def build(self, targets: list[str] | None = None, *, jobs: int = 4,
+              force: bool = False, dry_run: bool = False) -> BuildResult:
+        order = self.closure(targets)
+        state = self._load_state()
+        keys: dict[str, str] = {}
+        stale: set[str] = set()
+        for name in order:
+            keys[name] = self.node_key(name, keys)
+            node = self.nodes[name]
+            outputs_ok = all(Path(p).exists() for p in node.outputs)
+            if force or state.get(name) != keys[name] or not outputs_ok:
+                stale.add(name)
+
+        result = BuildResult(skipped=[n for n in order if n not in stale])
+        if dry_run:
+            for name in order:
+                print(f"{'RUN ' if name in stale else 'ok  '} {name}")
+            result.ran = [n for n in order if n in stale]
+            return result
+
+        pending = [n for n in order if n in stale]
+        done: set[str] = set(result.skipped)
+        running = {}
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            while pending or running:
+                for name in list(pending):
+                    deps = self.nodes[name].deps
+                    if any(d in result.failed for d in deps):
+                        result.failed[name] = "dependency failed"
+                        pending.remove(name)
+                    elif all(d in done for d in deps):
+                        print(f"▶ {name}")
+                        running[pool.submit(self._run, name)] = name
+                        pending.remove(name)
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    name = running.pop(fut)
+                    try:
+                        elapsed = fut.result()
+                    except Exception as exc:  # keep building unrelated nodes
+                        result.failed[name] = f"{type(exc).__name__}: {exc}"
+                        print(f"✗ {name}: {result.failed[name]}")
+                        continue
+                    done.add(name)
+                    result.ran.append(name)
+                    state[name] = keys[name]
+                    self._save_state(state)
+                    print(f"✓ {name} ({elapsed:.1f}s)")
+        return result
+
+    def _run(self, name: str) -> float:
+        start = time.perf_counter()
+        node = self.nodes[name]
+        node.action()
+        missing = [str(p) for p in node.outputs if not Path(p).exists()]
+        if missing:
+            raise FileNotFoundError(f"outputs not produced: {missing}")
+        return time.perf_counter() - start
+
+
+# =============================================================================
+# Metrics (data -> build/metrics/*.json)
+# =============================================================================
+ENTITY_TABLES = {
+    "Pull Requests": "pull_request",
+    "Repositories": "repository",
+    "Users": "user",
+    "Issues": "issue",
+    "PR Comments": "pr_comments",
+    "PR Reviews": "pr_reviews",
+    "PR Review Comments": "pr_review_comments",
+    "PR Commits": "pr_commits",
+    "File-Level Changes": "pr_commit_details",
+    "Related Issues": "related_issue",
+    "Timeline Events": "pr_timeline",
+    "PR Task Types": "pr_task_type",
+    "Human PRs": "human_pull_request",
+}
+
+
+# text source -> (table, column) for the vocabulary table
+VOCAB_SOURCES = {
+    "PR Titles": ("pull_request", "title"),
+    "PR Bodies": ("pull_request", "body"),
+    "Commit Messages": ("pr_commits", "message"),
+    "PR Comments": ("pr_comments", "body"),
+    "PR Reviews": ("pr_reviews", "body"),
+    "Issue Titles": ("issue", "title"),
+    "Issue Bodies": ("issue", "body"),
+}
+TOKEN_PATTERN = r"\w+"  # tokens are lower-cased before counting
+
+
+def _write_metrics(name: str, payload: dict) -> None:
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    (METRICS_DIR / f"{name}.json").write_text(json.dumps(payload, indent=2))
+
+
+def _read_metrics(name: str) -> dict:
+    return json.loads((METRICS_DIR / f"{name}.json").read_text())
+
+
+def compute_entity_counts() -> None:
+    """Row counts straight from parquet footers; no data pages are read."""
+    from aidev_data import open_parquet
+
+    counts = {label: open_parquet(table_path(table)).metadata.num_rows
+              for label, table in ENTITY_TABLES.items()}
+    _write_metrics("entity_counts", counts)
+
+
+def compute_code_metrics() -> None:
+    import numpy as np
+
+    from aidev_data import iter_batches
+    from streaming_stats import SummaryStatistics
+
+    added = deleted = 0
+    filenames: set[str] = set()
+    per_file = SummaryStatistics()
+    for chunk in iter_batches(table_path("pr_commit_details"),
+                              columns=["filename", "additions", "deletions"]):
+        additions = chunk["additions"].fillna(0).to_numpy(dtype=np.int64)
+        added += int(additions.sum())
+        deleted += int(chunk["deletions"].fillna(0).sum())
+        filenames.update(chunk["filename"].dropna().unique())
+        per_file.update(additions)
+    stats = per_file.to_dict()
+    _write_metrics("code_metrics", {
+        "Total Lines Added": added,
+        "Total Lines Deleted": deleted,
+        "Net Lines of Code": added - deleted,
+        "Unique Files Modified": len(filenames),
+        "Mean Additions per File": stats["mean"],
+        "Median Additions per File": stats["median"],
+    })
+
+
+def compute_author_metrics() -> None:
+    from actor_index import ActorIndex
+    from aidev_data import open_parquet
+
+    metrics = {"Total Users (User Table)": open_parquet(table_path("user")).metadata.num_rows}
+    metrics.update(ActorIndex.from_tables().role_counts().to_dict())
+    _write_metrics("author_metrics", metrics)
+
+
+def compute_vocab_metrics() -> None:
+    """Distinct tokens per text source and over all of them, streamed in batches."""
+    from aidev_data import iter_batches
+
+    vocabularies: dict[str, set[str]] = {}
+    for label, (table, column) in VOCAB_SOURCES.items():
+        tokens: set[str] = set()
+        for chunk in iter_batches(table_path(table), columns=[column]):
+            words = chunk[column].dropna().astype(str).str.lower().str.findall(TOKEN_PATTERN).explode()
+            tokens.update(words.dropna().unique())
+        vocabularies[label] = tokens
+    metrics = {label: len(tokens) for label, tokens in vocabularies.items()}
+    metrics["Total Unique Tokens"] = len(set().union(*vocabularies.values()))
+    _write_metrics("vocab", metrics)
+
+
+def ingest_revision() -> None:
+    """Apply the changed rows of a new dataset revision to the per-PR metric store."""
+    from incremental_ingest import ingest
+
+    ingest()
+
+
+def build_olap_cube() -> None:
+    from olap_cube import CUBE_PATH, Cube
+
+    Cube.build().save(CUBE_PATH)
+
+
+def compute_traceability() -> None:
+    """Issue <-> PR links and merge rates of linked vs unlinked PRs per agent."""
+    from traceability_index import INDEX_DIR, TraceabilityIndex
+
+    index = TraceabilityIndex.from_tables()
+    index.save(INDEX_DIR)
+    summary = index.summary().astype(object).where(lambda t: t.notna(), None)
+    _write_metrics("traceability", summary.to_dict(orient="index"))
+
+
+def compute_summary_stats() -> None:
+    from streaming_stats import entity_summary_table
+
+    table = entity_summary_table()
+    _write_metrics("summary_stats", table.to_dict(orient="index"))
+
+
+# =============================================================================
+# Tables (metrics -> latex/tables/*.tex)
+# =============================================================================
+def _fmt_int(value: float) -> str:
+    return f"{int(round(value)):,}"
+
+
+def latex_table(caption: str, label: str, header: list[str], rows: list[list[str]],
+                *, column_format: str, total: list[str] | None = None, size: str = "") -> str:
+    """Render a booktabs table in the layout used throughout report.tex."""
+    lines = [
+        r"\begin{table}[H]",
+        r"\centering",
+        rf"\caption{{{caption}}}",
+        rf"\label{{{label}}}",
+    ]
+    if size:
+        lines.append(size)
+    lines += [
+        rf"\begin{{tabular}}{{@{{}}{column_format}@{{}}}}",
+        r"\toprule",
+        " & ".join(rf"\textbf{{{h}}}" for h in header) + r" \\",
+        r"\midrule",
+    ]
+    lines += [" & ".join(row) + r" \\" for row in rows]
+    if total is not None:
+        lines.append(r"\midrule")
+        lines.append(" & ".join(rf"\textbf{{{v}}}" for v in total) + r" \\")
+    lines += [r"\bottomrule", r"\end{tabular}", r"\end{table}", ""]
+    return "\n".join(lines)
+
+
+def render_entity_counts(metrics: dict) -> str:
+    rows = [[label, _fmt_int(count)] for label, count in metrics.items()]
+    return latex_table("Dataset Entity Counts", "tab:entity_counts",
+                       ["Entity Type", "Count"], rows, column_format="lr",
+                       total=["Total Entities", _fmt_int(sum(metrics.values()))])
+
+
+def render_code_metrics(metrics: dict) -> str:
+    rows = [[label, f"{value:,.1f}" if isinstance(value, float) else _fmt_int(value)]
+            for label, value in metrics.items()]
+    return latex_table("Lines of Code Statistics", "tab:loc_stats",
+                       ["Metric", "Value"], rows, column_format="lr")
+
+
+def render_author_metrics(metrics: dict) -> str:
+    rows = [[label, _fmt_int(value)] for label, value in metrics.items()]
+    return latex_table("Author and People Metrics", "tab:author_metrics",
+                       ["Role", "Unique Count"], rows, column_format="lr")
+
+
+def render_summary_stats(metrics: dict) -> str:
+    rows = [[label, f"{s['mean']:,.2f}", f"{s['median']:,.1f}", _fmt_int(s["max"])]
+            for label, s in metrics.items()]
+    return latex_table("Entity Summary Statistics", "tab:summary_stats",
+                       ["Metric", "Mean", "Median", "Max"], rows,
+                       column_format="lrrr", size=r"\small")
+
+
+def render_vocab(metrics: dict) -> str:
+    metrics = dict(metrics)
+    total = metrics.pop("Total Unique Tokens")
+    rows = [[label, _fmt_int(count)] for label, count in metrics.items()]
+    return latex_table("Vocabulary Statistics", "tab:vocab",
+                       ["Text Source", "Unique Tokens"], rows, column_format="lr",
+                       total=["Total Unique Tokens", _fmt_int(total)])
+
+
+TABLE_RENDERERS = {
+    "entity_counts": render_entity_counts,
+    "code_metrics": render_code_metrics,
+    "author_metrics": render_author_metrics,
+    "vocab": render_vocab,
+    "summary_stats": render_summary_stats,
+}
+
+# report.tex macro -> (metrics file, key), written to tables/macros.tex
+REPORT_MACROS = {
+    "UniqueFilesModified": ("code_metrics", "Unique Files Modified"),
+}
+
+
+def render_macros(metrics: dict[str, dict]) -> str:
+    lines = ["% generated by build_report.py; do not edit"]
+    lines += [rf"\newcommand{{\{macro}}}{{{_fmt_int(metrics[name][key])}}}"
+              for macro, (name, key) in REPORT_MACROS.items()]
+    return "\n".join(lines) + "\n"
+
+
+def write_tables() -> None:
+    TABLES_DIR.mkdir(parents=True, exist_ok=True)
+    for name, render in TABLE_RENDERERS.items():
+        (TABLES_DIR / f"{name}.tex").write_text(render(_read_metrics(name)))
+    metrics = {name: _read_metrics(name) for name, _ in REPORT_MACROS.values()}
+    (TABLES_DIR / "macros.tex").write_text(render_macros(metrics))
+
+
+# =============================================================================
+# Figures and PDF
+# =============================================================================
+def _run_script(script: str) -> Callable[[], None]:
+    def action() -> None:
+        # The figure scripts write to ./figures_individual relative to the cwd.
+        subprocess.run([sys.executable, str(CODE_DIR / script)], cwd=LATEX_DIR, check=True,
+                       stdout=subprocess.DEVNULL)
+    return action
+
+
+def check_notebook_figures() -> None:
+    missing = [p for p in notebook_figures() if not p.exists()]
+    if missing:
+        raise FileNotFoundError(f"rerun the analysis notebooks to produce {[str(p) for p in missing]}")
+
+
+def compile_report() -> None:
+    if shutil.which("pdflatex") is None:
+        raise RuntimeError("pdflatex not found on PATH")
+    for aux in ("report.aux", "report.log", "report.out", "report.toc"):
+        (LATEX_DIR / aux).unlink(missing_ok=True)
+    for _ in range(2):  # second pass resolves references and the TOC
+        subprocess.run(["pdflatex", "-interaction=nonstopmode", "report.tex"], cwd=LATEX_DIR,
+                       check=True, stdout=subprocess.DEVNULL)
+
+
+def _fig(name: str) -> Path:
+    return LATEX_DIR / "figures_individual" / name
+
+
+def report_figures(directory: str) -> list[Path]:
+    """Files under latex/*directory* that report.tex includes, in order."""
+    text = (LATEX_DIR / "report.tex").read_text()
+    names = re.findall(rf"\\includegraphics(?:\[[^\]]*\])?{{{re.escape(directory)}/([^}}]+)}}", text)
+    return [LATEX_DIR / directory / name for name in dict.fromkeys(names)]
+
+
+def notebook_figures() -> list[Path]:
+    return report_figures("figures")
+
+
+def _code(*names: str) -> tuple[str, ...]:
+    return tuple(str(CODE_DIR / n) for n in names)
+
+
+def _data(*tables: str) -> tuple[str, ...]:
+    return tuple(table_path(t) for t in tables)
+
+
+def figure_node(name: str, script: str, description: str) -> Node:
+    """Node for a figure script, with the outputs and tables of its registry."""
+    registry = importlib.import_module(Path(script).stem).registry
+    tables = sorted({t for figure in registry.figures for t in figure.tables})
+    code = _code(script, "figure_tools.py", "aidev_data.py", "compact_schema.py")
+    return Node(name, _run_script(script), sources=code + _data(*tables),
+                outputs=tuple(_fig(f"{figure.name}.png") for figure in registry.figures),
+                description=description)
+
+
+def default_nodes() -> list[Node]:
+    metric_code = _code("build_report.py", "aidev_data.py", "streaming_stats.py")
+    return [
+        Node("entity_counts", compute_entity_counts,
+             sources=metric_code + _data(*ENTITY_TABLES.values()),
+             outputs=(METRICS_DIR / "entity_counts.json",),
+             description="row counts per table"),
+        Node("code_metrics", compute_code_metrics,
+             sources=metric_code + _data("pr_commit_details"),
+             outputs=(METRICS_DIR / "code_metrics.json",),
+             description="lines of code statistics"),
+        Node("author_metrics", compute_author_metrics,
+             sources=metric_code + _code("actor_index.py")
+             + _data("user", *sorted({t for t, _ in ACTOR_ROLES.values()})),
+             outputs=(METRICS_DIR / "author_metrics.json",),
+             description="distinct actors per role"),
+        Node("summary_stats", compute_summary_stats,
+             sources=metric_code + _data("pull_request", "pr_commits", "pr_reviews", "pr_comments",
+                                         "pr_commit_details", "pr_timeline"),
+             outputs=(METRICS_DIR / "summary_stats.json",),
+             description="entity summary statistics"),
+        Node("vocab", compute_vocab_metrics,
+             sources=metric_code + _data(*dict.fromkeys(t for t, _ in VOCAB_SOURCES.values())),
+             outputs=(METRICS_DIR / "vocab.json",),
+             description="distinct tokens per text source"),
+        Node("traceability", compute_traceability,
+             sources=metric_code + _code("traceability_index.py")
+             + _data("pull_request", "issue", "related_issue", "pr_commits"),
+             outputs=(METRICS_DIR / "traceability.json", BUILD_DIR / "traceability" / "adjacency.npz"),
+             description="issue <-> PR links, linked vs unlinked merge rates"),
+        Node("ingest", ingest_revision,
+             sources=_code("aidev_data.py", "incremental_ingest.py")
+             + _data("pull_request", "pr_commits", "pr_comments", "pr_reviews",
+                     "pr_review_comments", "pr_timeline", "pr_commit_details"),
+             outputs=(BUILD_DIR / "ingest" / "revision.json",),
+             description="per-PR metrics and agent totals, updated by delta"),
+        Node("cube", build_olap_cube,
+             deps=("ingest",),
+             sources=_code("olap_cube.py") + _data("pr_task_type", "repository"),
+             outputs=(BUILD_DIR / "cube.parquet",),
+             description="agent x task type x month x language x star band cube"),
+        Node("tables", write_tables,
+             deps=tuple(TABLE_RENDERERS),
+             sources=_code("build_report.py"),
+             outputs=tuple(TABLES_DIR / f"{n}.tex" for n in [*TABLE_RENDERERS, "macros"]),
+             description="LaTeX tables and prose macros from metrics"),
+        figure_node("individual_figures", "regenerate_individual_figures.py", "figures 01-30"),
+        figure_node("entity_figures", "generate_entity_distribution_figures.py", "figures 31-39"),
+        Node("notebook_figures", check_notebook_figures,
+             sources=tuple(str(p) for p in notebook_figures()),
+             outputs=tuple(notebook_figures()),
+             description="latex/figures/ from the analysis notebooks (checked, not rebuilt)"),
+        Node("report", compile_report,
+             deps=("tables", "individual_figures", "entity_figures", "notebook_figures"),
+             sources=(str(LATEX_DIR / "report.tex"),),
+             outputs=(LATEX_DIR / "report.pdf",),
+             description="pdflatex (two passes)"),
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("targets", nargs="*", help="nodes to build (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="nodes to run in parallel")
+    parser.add_argument("--force", action="store_true", help="rebuild even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="show what would run")
+    parser.add_argument("--list", action="store_true", help="list nodes and exit")
+    args = parser.parse_args(argv)
+
+    graph = ReportGraph(default_nodes())
+    if args.list:
+        for node in graph.nodes.values():
+            deps = f"  <- {', '.join(node.deps)}" if node.deps else ""
+            print(f"{node.name:<20} {node.description}{deps}")
+        return 0
+
+    result = graph.build(args.targets or None, jobs=args.jobs, force=args.force,
+                         dry_run=args.dry_run)
+    if not args.dry_run:
+        print(f"\nran {len(result.ran)}, up to date {len(result.skipped)}, failed {len(result.failed)}")
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+"""
+Declared compact dtypes for the AIDev tables, a memory budget for the frames
+loaded with them, and a per-table size report.
+
+A plain `read_parquet` keeps int64 ids and counts, float64 for any numeric
+column with gaps, and one string per cell even for columns with a handful of
+distinct values (agent, state, event, language). `SCHEMA` gives every known
+column a kind instead:
+
+- "id": integer key, stored as int32 / uint32 when its range allows (GitHub
+  ids above 2**32 stay int64);
+- "count": additions, stars, followers...; int32 (int64 past 2**31). With
+  gaps a count stays float64: float32 would keep each value exact, but sums
+  and means over it (per-PR additions, figure captions) would round;
+- "category": repeated strings, dictionary-encoded;
+- "text": free text and urls, as Arrow-backed strings;
+- "timestamp": ISO strings parsed to datetime64[ns, UTC].
+
+Columns a table does not declare are inferred the same way (integers as
+"count", strings as "category" when at most half of them are distinct,
+"text" otherwise). Numbers and strings keep their values and only change
+storage; ids and counts that do not fit a narrower type are left alone.
+"timestamp" is the one change of type: ISO strings become UTC datetimes, as
+every consumer parsed them anyway (a column that does not parse is left as
+strings).
+
+`aidev_data.load_table(name, compact=True)` (or AIDEV_COMPACT=1) applies the
+schema on load. With AIDEV_MEMORY_BUDGET (e.g. "2GB") the compact tables
+loaded by the process are counted against a budget; past it, a table is
+either loaded anyway with a MemoryBudgetWarning (AIDEV_MEMORY_ACTION=warn,
+the default) or spilled (=spill): written to an Arrow file under
+AIDEV_SPILL_DIR and mapped back as disk-backed Arrow columns, whose pages the
+OS can drop and re-read instead of holding them in RSS.
+
+Usage:
+    python compact_schema.py report
+    python compact_schema.py report --table pr_commit_details --columns
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import itertools
+import os
+import re
+import tempfile
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from aidev_data import TABLES, load_table
+
+# =============================================================================
+# Declared schema
+# =============================================================================
+_TIMESTAMPS = {c: "timestamp" for c in ("created_at", "updated_at", "closed_at", "merged_at",
+                                         "submitted_at")}
+
+_PR = {"id": "id", "number": "count", "title": "text", "body": "text", "agent": "category",
+       "user_id": "id", "user": "category", "state": "category", "repo_id": "id",
+       "repo_url": "category", "html_url": "text", **_TIMESTAMPS}
+_REPOSITORY = {"id": "id", "url": "text", "full_name": "text", "language": "category",
+               "forks": "count", "stars": "count", "open_issues": "count"}
+_USER = {"id": "id", "login": "text", "followers": "count", "following": "count", **_TIMESTAMPS}
+_TASK_TYPE = {"id": "id", "agent": "category", "type": "category", "title": "text",
+              "reason": "text", "confidence": "count"}
+_COMMIT = {"sha": "text", "pr_id": "id", "author": "category", "committer": "category",
+           "message": "text"}
+_ACTIVITY = {"id": "id", "pr_id": "id", "user": "category", "user_id": "id",
+             "user_type": "category", "state": "category", "body": "text", **_TIMESTAMPS}
+
+# table -> column -> kind; columns missing from a snapshot are skipped
+SCHEMA: dict[str, dict[str, str]] = {
+    "pull_request": _PR,
+    "human_pull_request": _PR,
+    "all_pull_request": _PR,
+    "repository": _REPOSITORY,
+    "all_repository": _REPOSITORY,
+    "user": _USER,
+    "all_user": _USER,
+    "pr_comments": _ACTIVITY,
+    "pr_reviews": _ACTIVITY,
+    "pr_review_comments": {**_ACTIVITY, "pull_request_review_id": "id", "path": "category",
+                           "diff_hunk": "text", "commit_id": "category",
+                           "original_commit_id": "category", "position": "count",
+                           "original_position": "count", "pull_request_url": "category",
+                           "html_url": "text"},
+    "pr_commits": _COMMIT,
+    # one row per changed file: the commit columns repeat for each of its files
+    "pr_commit_details": {**{c: "category" for c in _COMMIT}, "pr_id": "id",
+                          "commit_stats_total": "count", "commit_stats_additions": "count",
+                          "commit_stats_deletions": "count", "filename": "category",
+                          "status": "category", "additions": "count", "deletions": "count",
+                          "changes": "count", "patch": "text"},
+    "related_issue": {"pr_id": "id", "issue_id": "id", "source": "category"},
+    "issue": {"id": "id", "number": "count", "title": "text", "body": "text", "user": "category",
+              "state": "category", "html_url": "text", **_TIMESTAMPS},
+    "pr_timeline": {"id": "id", "pr_id": "id", "event": "category", "commit_id": "text",
+                    "actor": "category", "assignee": "category", "label": "category",
+                    "message": "text", **_TIMESTAMPS},
+    "pr_task_type": _TASK_TYPE,
+    "human_pr_task_type": _TASK_TYPE,
+}
+
+KINDS = ("id", "count", "category", "text", "timestamp")
+
+# NaN-semantics Arrow strings: pandas' default `str` dtype from 3.0 on
+try:
+    TEXT_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)
+except TypeError:  # pandas < 2.3
+    TEXT_DTYPE = pd.StringDtype("pyarrow_numpy")
+
+_FLOAT32_EXACT = 2 ** 24
+
+
+def infer_kind(series: pd.Series) -> str | None:
+    """Kind for an undeclared column, or None to leave it as loaded."""
+    if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+        return None
+    if pd.api.types.is_integer_dtype(series):
+        return "count"
+    if pd.api.types.is_string_dtype(series):  # object columns only when all strings
+        return "category" if series.nunique() <= len(series) // 2 else "text"
+    return None
+
+
+def _downcast_int(values: pd.Series, candidates: Sequence[type]) -> pd.Series:
+    lo, hi = values.min(), values.max()
+    for dtype in candidates:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return values.astype(dtype)
+    return values
+
+
+def compact_column(series: pd.Series, kind: str) -> pd.Series:
+    """*series* stored as *kind* (see the module docstring); values are unchanged."""
+    if kind in ("id", "count"):
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            return series
+        if series.isna().any():
+            # gaps force a float; ids go float32 while every value stays exact,
+            # counts keep float64 so that aggregates over them do not round
+            if (kind == "id" and series.abs().max() < _FLOAT32_EXACT
+                    and (series.dropna() % 1 == 0).all()):
+                return series.astype(np.float32)
+            return series
+        if not len(series):
+            return series.astype(np.int32)
+        if (series % 1 != 0).any():
+            return series
+        candidates = (np.int32, np.uint32, np.int64) if kind == "id" else (np.int32, np.int64)
+        return _downcast_int(series, candidates)
+    if kind == "category":
+        return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    if kind == "text":
+        if not pd.api.types.is_string_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            return series
+        return series.astype(TEXT_DTYPE)
+    if kind == "timestamp":
+        if isinstance(series.dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(series):
+            return series
+        try:
+            return pd.to_datetime(series, utc=True, format="ISO8601")
+        except (TypeError, ValueError):
+            return series
+    raise ValueError(f"unknown column kind {kind!r}; expected one of {KINDS}")
+
+
+def compact(frame: pd.DataFrame, table: str) -> pd.DataFrame:
+    """*frame* (a load of *table*) with every column in its compact dtype."""
+    declared = SCHEMA.get(table, {})
+    out = {}
+    for column in frame.columns:
+        kind = declared.get(column) or infer_kind(frame[column])
+        out[column] = compact_column(frame[column], kind) if kind else frame[column]
+    return pd.DataFrame(out, index=frame.index)
+
+
+def frame_bytes(frame: pd.DataFrame) -> int:
+    """Deep in-memory size of *frame*, index included."""
+    return int(frame.memory_usage(deep=True, index=True).sum())
+
+
+# =============================================================================
+# Memory budget
+# =============================================================================
+class MemoryBudgetWarning(UserWarning):
+    """A compact table was loaded past the configured memory budget."""
+
+
+_SIZE = re.compile(r"^\s*([\d.]+)\s*([kmgt]?i?b?)?\s*$", re.IGNORECASE)
+_UNITS = {"": 1, "k": 2 ** 10, "m": 2 ** 20, "g": 2 ** 30, "t": 2 ** 40}
+
+
+def parse_bytes(text: str) -> int:
+    """'2GB', '512m', '1.5 GiB' or a plain number of bytes."""
+    m = _SIZE.match(text)
+    if not m:
+        raise ValueError(f"cannot parse a size from {text!r}")
+    unit = (m.group(2) or "").lower().rstrip("b").rstrip("i")
+    return int(float(m.group(1)) * _UNITS[unit])
+
+
+def _human(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024:
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
+    return f"{n:,.1f} TB"
+
+
+@dataclass
+class MemoryBudget:
+    """
+    Upper bound on the bytes held by the compact tables a process loads.
+
+    Args:
+        limit: Budget in bytes.
+        action: "warn" loads past the budget with a MemoryBudgetWarning;
+            "spill" turns the table that would exceed it into disk-backed
+            Arrow columns instead.
+        spill_dir: Where spilled tables are written.
+    """
+    limit: int
+    action: str = "warn"
+    spill_dir: Path = field(default_factory=lambda: Path(tempfile.gettempdir()) / "aidev-spill")
+    resident: dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.action not in ("warn", "spill"):
+            raise ValueError(f"memory budget action must be 'warn' or 'spill', not {self.action!r}")
+
+    @classmethod
+    def from_env(cls) -> "MemoryBudget | None":
+        limit = os.environ.get("AIDEV_MEMORY_BUDGET")
+        if not limit:
+            return None
+        spill_dir = os.environ.get("AIDEV_SPILL_DIR")
+        return cls(parse_bytes(limit), os.environ.get("AIDEV_MEMORY_ACTION", "warn"),
+                   **({"spill_dir": Path(spill_dir)} if spill_dir else {}))
+
+    @property
+    def used(self) -> int:
+        return sum(self.resident.values())
+
+    def admit(self, name: str, frame: pd.DataFrame) -> pd.DataFrame:
+        """Account for *frame* as table *name*, spilling or warning past the limit."""
+        size = frame_bytes(frame)
+        # reloading a table replaces its previous copy
+        used = self.used - self.resident.get(name, 0)
+        if used + size <= self.limit:
+            self.resident[name] = size
+            return frame
+        message = (f"loading {name} ({_human(size)}) brings compact tables to "
+                   f"{_human(used + size)}, over the {_human(self.limit)} budget")
+        if self.action == "warn":
+            warnings.warn(message, MemoryBudgetWarning, stacklevel=3)
+            self.resident[name] = size
+            return frame
+        self.resident[name] = 0  # mapped pages are file-backed, not counted
+        print(f"  {message}; spilling to {self.spill_dir}/")
+        return spill(frame, self.spill_dir, name)
+
+    def release(self, name: str) -> None:
+        """Stop counting table *name* (after the caller dropped it)."""
+        self.resident.pop(name, None)
+
+
+_spill_ids = itertools.count()
+SPILL_BATCH_ROWS = 65_536
+
+
+def spill(frame: pd.DataFrame, directory: Path, name: str = "frame",
+          batch_rows: int = SPILL_BATCH_ROWS) -> pd.DataFrame:
+    """
+    Write *frame* as an uncompressed Arrow file and map it back.
+
+    Rows are converted and written *batch_rows* at a time, so spilling never
+    holds a second full copy of the table in memory. The returned columns are
+    Arrow arrays (`pd.ArrowDtype`) over the mapped file, so only the pages
+    actually read are resident.
+    """
+    import pyarrow as pa
+
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}-{os.getpid()}-{next(_spill_ids)}.arrow"
+    # typed from the dtypes; only object columns are converted (one at a time) to infer theirs
+    schema = pa.Schema.from_pandas(frame, preserve_index=False)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for start in range(0, len(frame), batch_rows):
+            chunk = frame.iloc[start:start + batch_rows]
+            writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+    mapped = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    try:
+        path.unlink()  # the mapping keeps the data reachable on POSIX
+    except OSError:
+        atexit.register(path.unlink, missing_ok=True)
+    out = mapped.to_pandas(types_mapper=pd.ArrowDtype)
+    out.index = frame.index
+    return out
+
+
+BUDGET: MemoryBudget | None = MemoryBudget.from_env()
+
+
+def set_memory_budget(budget: MemoryBudget | str | int | None, action: str = "warn") -> None:
+    """Set the budget (a MemoryBudget, a size like "2GB" or bytes), or None to lift it."""
+    global BUDGET
+    if isinstance(budget, (str, int)):
+        budget = MemoryBudget(parse_bytes(str(budget)), action)
+    BUDGET = budget
+
+
+def admit(name: str, frame: pd.DataFrame) -> pd.DataFrame:
+    """Apply the current budget (if any) to a freshly loaded compact table."""
+    return frame if BUDGET is None else BUDGET.admit(name, frame)
+
+
+# =============================================================================
+# Report
+# =============================================================================
+def memory_report(tables: Sequence[str], base: str | None = None,
+                  columns: bool = False) -> pd.DataFrame:
+    """
+    Bytes of each table as loaded and after `compact`.
+
+    One row per table, or per (table, column) with *columns*, with the dtype
+    before and after in that case.
+    """
+    rows = []
+    for name in tables:
+        raw = load_table(name, base=base, compact=False)
+        small = compact(raw, name)
+        if columns:
+            before = raw.memory_usage(deep=True, index=False)
+            after = small.memory_usage(deep=True, index=False)
+            rows += [{"table": name, "column": c, "rows": len(raw), "before": int(before[c]),
+                      "after": int(after[c]), "dtype_before": str(raw[c].dtype),
+                      "dtype_after": str(small[c].dtype)} for c in raw.columns]
+        else:
+            rows.append({"table": name, "rows": len(raw), "before": frame_bytes(raw),
+                         "after": frame_bytes(small)})
+        del raw, small
+    report = pd.DataFrame(rows)
+    report["saved"] = 1 - report["after"] / report["before"].replace(0, np.nan)
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="per-table bytes before / after compaction")
+    report.add_argument("--table", action="append", help="only these tables (repeatable)")
+    report.add_argument("--columns", action="store_true", help="break the report down by column")
+    report.add_argument("--base", help="snapshot location (default: AIDEV_DATA_DIR / Hugging Face)")
+    args = parser.parse_args(argv)
+
+    tables = args.table or [t for t in TABLES if not t.startswith("all_")]
+    result = memory_report(tables, args.base, columns=args.columns)
+    shown = result.assign(before=result["before"].map(_human), after=result["after"].map(_human),
+                          saved=result["saved"].map(lambda v: f"{v:.0%}"))
+    print(shown.to_string(index=False))
+    before, after = result["before"].sum(), result["after"].sum()
+    print(f"\n✓ {_human(before)} -> {_human(after)} ({1 - after / max(before, 1):.0%} smaller)")
+
+
+if __name__ == "__main__":
+    main()
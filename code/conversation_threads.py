@@ -0,0 +1,193 @@
+"""
+Per-PR conversation threads for review-depth (Figure 7) and human vs bot
+engagement (Figure 5) analyses.
+
+`pr_comments`, `pr_reviews` and `pr_review_comments` are stacked into one
+event array, sorted once by (pr_id, timestamp), and every per-PR measure is
+computed with segment-wise NumPy reductions over that order:
+
+- depth: number of messages, split by source and by human/bot author;
+- turn-taking: speaker changes and human<->bot hand-offs;
+- latency: time from PR creation to the first message, and between
+  consecutive messages by different speakers.
+
+Messages without a login (deleted accounts) count towards depth, but their
+author is unknown: they add no participant, turn or reply latency.
+
+The result is one compact row per PR (int32/float32 columns).
+
+Usage:
+    python conversation_threads.py --out build/conversations.parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aidev_data import load_table
+
+SECONDS_TO_HOUR = 3600
+
+# table -> (timestamp column, source code)
+THREAD_SOURCES = {
+    "pr_comments": ("created_at", 0),
+    "pr_reviews": ("submitted_at", 1),
+    "pr_review_comments": ("created_at", 2),
+}
+SOURCE_NAMES = {0: "comments", 1: "reviews", 2: "review_comments"}
+
+COUNT_COLUMNS = ["events", *SOURCE_NAMES.values(), "bot_events", "human_events",
+                 "participants", "turns", "human_bot_handoffs"]
+
+DEPTH_BINS = [-1, 0, 2, 5, 10, np.inf]
+DEPTH_LABELS = ["none", "1-2", "3-5", "6-10", ">10"]
+
+
+def is_bot(logins: pd.Series, user_types: pd.Series | None = None) -> np.ndarray:
+    """Bot flag with the same rule as the reviewer analysis: type 'Bot' or a '[bot]' login."""
+    flag = (logins.fillna("").astype(str).str.lower().str.endswith("[bot]")
+            .to_numpy(dtype=bool, copy=True))
+    if user_types is not None:
+        flag |= (user_types == "Bot").to_numpy()
+    return flag
+
+
+def _events(frame: pd.DataFrame, ts_col: str, source: int) -> pd.DataFrame:
+    user_types = frame["user_type"] if "user_type" in frame.columns else None
+    return pd.DataFrame({
+        "pr_id": frame["pr_id"].to_numpy(),
+        "ts": pd.to_datetime(frame[ts_col], utc=True, errors="coerce"),
+        "user": frame["user"].to_numpy(dtype=object),  # missing logins stay missing
+        "is_bot": is_bot(frame["user"], user_types),
+        "source": np.full(len(frame), source, dtype=np.int8),
+    })
+
+
+def stack_events(tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate the thread tables into one (pr_id, ts, user, is_bot, source) frame."""
+    parts = [_events(tables[name], ts_col, source)
+             for name, (ts_col, source) in THREAD_SOURCES.items() if name in tables]
+    events = pd.concat(parts, ignore_index=True)
+    return events[events["ts"].notna()]
+
+
+def build_conversations(events: pd.DataFrame,
+                        pr_df: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Compute the per-PR conversation table from stacked events.
+
+    Args:
+        events: Output of `stack_events`.
+        pr_df: Optional pull_request frame (`id`, `created_at`, optionally
+            `agent`, `merged_at`). When given, every PR gets a row (silent PRs
+            have depth 0), first-response latency is measured from PR
+            creation, and agent / merge outcome are attached.
+
+    Returns:
+        DataFrame indexed by pr_id.
+    """
+    pr_ids = events["pr_id"].to_numpy()
+    ts = events["ts"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    actor = pd.factorize(events["user"])[0].astype(np.int32)  # -1: unknown author
+    bot = events["is_bot"].to_numpy(dtype=bool)
+    source = events["source"].to_numpy(dtype=np.int8)
+
+    order = np.lexsort((ts, pr_ids))
+    pr_ids, ts, actor, bot, source = pr_ids[order], ts[order], actor[order], bot[order], source[order]
+
+    n = pr_ids.size
+    if n == 0:
+        # same columns as the non-empty case, so the pr_df join below still applies
+        out = pd.DataFrame({**{col: pd.Series(dtype=np.int32) for col in COUNT_COLUMNS},
+                            "median_response_hours": pd.Series(dtype=np.float32),
+                            "bot_to_human_hours": pd.Series(dtype=np.float32),
+                            "first_event_ts": pd.Series(dtype="datetime64[ns, UTC]")},
+                           index=pd.Index(pr_ids, name="pr_id"))
+    else:
+        same_pr = pr_ids[1:] == pr_ids[:-1]
+        starts = np.flatnonzero(np.r_[True, ~same_pr])
+        group = np.repeat(np.arange(starts.size), np.diff(np.r_[starts, n]))
+
+        def seg_sum(values: np.ndarray) -> np.ndarray:
+            return np.add.reduceat(values, starts) if values.size else np.zeros(starts.size)
+
+        out = pd.DataFrame(index=pd.Index(pr_ids[starts], name="pr_id"))
+        out["events"] = np.diff(np.r_[starts, n]).astype(np.int32)
+        for code, name in SOURCE_NAMES.items():
+            out[name] = seg_sum((source == code).astype(np.int32)).astype(np.int32)
+        out["bot_events"] = seg_sum(bot.astype(np.int32)).astype(np.int32)
+        out["human_events"] = out["events"] - out["bot_events"]
+
+        # distinct participants: unique (group, actor) pairs counted per group
+        known = actor >= 0
+        width = max(int(actor.max()), 0) + 1
+        pair = np.unique(group[known].astype(np.int64) * width + actor[known])
+        out["participants"] = np.bincount(pair // width, minlength=starts.size).astype(np.int32)
+
+        # turn-taking and latency between consecutive messages of one PR
+        speaker_change = same_pr & known[1:] & known[:-1] & (actor[1:] != actor[:-1])
+        handoff = same_pr & (bot[1:] != bot[:-1])
+        bot_to_human = handoff & bot[:-1]
+        next_group = group[1:]
+        out["turns"] = (np.bincount(next_group[speaker_change], minlength=starts.size) + 1).astype(np.int32)
+        out["human_bot_handoffs"] = np.bincount(next_group[handoff], minlength=starts.size).astype(np.int32)
+
+        gap_hours = np.diff(ts) / 1e9 / SECONDS_TO_HOUR
+        reply = pd.Series(gap_hours[speaker_change]).groupby(next_group[speaker_change])
+        out["median_response_hours"] = reply.median().reindex(range(starts.size)).to_numpy(np.float32)
+        human_reply = pd.Series(gap_hours[bot_to_human]).groupby(next_group[bot_to_human])
+        out["bot_to_human_hours"] = human_reply.mean().reindex(range(starts.size)).to_numpy(np.float32)
+        out["first_event_ts"] = pd.to_datetime(ts[starts], utc=True)
+
+    if pr_df is not None:
+        prs = pr_df.set_index("id")
+        out = out.reindex(prs.index.rename("pr_id"))
+        out[COUNT_COLUMNS] = out[COUNT_COLUMNS].fillna(0).astype(np.int32)
+        out.loc[out["events"] == 0, "turns"] = 0
+        created = pd.to_datetime(prs["created_at"], utc=True, errors="coerce")
+        out["first_response_hours"] = ((out["first_event_ts"] - created).dt.total_seconds()
+                                       / SECONDS_TO_HOUR).astype(np.float32)
+        for col in ("agent", "merged_at"):
+            if col in prs.columns:
+                out[col] = prs[col]
+        if "merged_at" in out.columns:
+            out["is_merged"] = out.pop("merged_at").notna()
+        if "agent" in out.columns:
+            out["agent"] = out["agent"].astype("category")
+
+    out["depth_bucket"] = pd.cut(out["events"], DEPTH_BINS, labels=DEPTH_LABELS)
+    return out.drop(columns="first_event_ts", errors="ignore")
+
+
+def merge_rate_by_depth(conversations: pd.DataFrame) -> pd.DataFrame:
+    """Merge rate and PR count per depth bucket (the Figure 7 summary)."""
+    if "is_merged" not in conversations.columns:
+        raise ValueError("merge_rate_by_depth needs is_merged: pass a pr_df with merged_at "
+                         "to build_conversations")
+    return (conversations.groupby("depth_bucket", observed=False)
+            .agg(prs=("events", "size"), merge_rate=("is_merged", "mean")))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", type=Path, help="write the per-PR table as parquet")
+    args = parser.parse_args(argv)
+
+    tables = {name: load_table(name, columns=["pr_id", ts_col, "user", "user_type"])
+              for name, (ts_col, _) in THREAD_SOURCES.items()}
+    pr_df = load_table("pull_request", columns=["id", "agent", "created_at", "merged_at"])
+    conversations = build_conversations(stack_events(tables), pr_df)
+    print(f"✓ {len(conversations):,} PRs, {int(conversations['events'].sum()):,} messages")
+    print(merge_rate_by_depth(conversations).to_string())
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        conversations.to_parquet(args.out)
+        print("Wrote", args.out)
+
+
+if __name__ == "__main__":
+    main()
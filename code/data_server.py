@@ -0,0 +1,280 @@
+"""
+Warm, in-memory AIDev data service over Arrow Flight.
+
+Every notebook and script reloads and re-derives the same tables. This
+server loads them once, applies the shared preprocessing (UTC timestamps,
+categorical agents, lower-cased states, per-PR activity metrics and the
+repository star count on each PR) and keeps them as Arrow tables. Clients
+ask for a table, a column projection and simple filters; the server filters
+with `pyarrow.compute` and streams record batches back, which the client
+turns into DataFrames without a parse step.
+
+Start the server once (keep it running in a terminal):
+    python data_server.py serve                       # grpc://127.0.0.1:8815
+    python data_server.py serve --location grpc+unix:///tmp/aidev.sock
+
+Then, in a notebook, swap the loaders:
+    from data_server import DataClient
+    client = DataClient()
+    data = client.load_hf_data(stars_range=[100, None])   # productivity.ipynb
+    pop_pr_df = client.table("pull_request")              # already preprocessed
+    repos = client.load_repo_meta("Cursor")               # language_usage.ipynb
+
+Set AIDEV_SERVER to point clients at a non-default location. With
+AIDEV_SAMPLE=0.05 the server holds an agent-stratified 5% preview instead of
+the full tables (see aidev_data).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.flight as flight
+
+from aidev_data import load_table
+
+DEFAULT_LOCATION = os.environ.get("AIDEV_SERVER", "grpc://127.0.0.1:8815")
+
+# loaded when the server starts; everything else in aidev_data.TABLES on first use
+EAGER_TABLES = ["pull_request", "repository", "pr_task_type",
+                "human_pull_request", "human_pr_task_type"]
+
+# per-PR count columns derived from child tables: column -> (table, value or None)
+PR_ACTIVITY = {
+    "commits": ("pr_commits", None),
+    "comments": ("pr_comments", None),
+    "reviews": ("pr_reviews", None),
+    "timeline_events": ("pr_timeline", None),
+    "files_changed": ("pr_commit_details", None),
+    "additions": ("pr_commit_details", "additions"),
+    "deletions": ("pr_commit_details", "deletions"),
+}
+
+
+# =============================================================================
+# Shared preprocessing
+# =============================================================================
+def preprocess(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Parse timestamps as UTC, lower-case `state` and make `agent` categorical.
+
+    dataset_overview.ipynb uses this function. Its old local version differed
+    in two ways, neither of which changes its summaries:
+
+    - `id` stays an integer instead of being cast to str, so ids still match
+      `pr_id` in the child tables and the server's range filters;
+    - a missing `state` stays missing instead of becoming the string "none".
+    """
+    df = df.copy()
+    for col in ["created_at", "closed_at", "merged_at", "submitted_at", "updated_at"]:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce", utc=True)
+    if "state" in df.columns:
+        df["state"] = df["state"].str.lower()
+    if "agent" in df.columns:
+        df["agent"] = df["agent"].astype("category")
+    if "type" in df.columns:
+        df["type"] = df["type"].astype(str).str.strip()
+    return df
+
+
+def add_pr_metrics(pr_df: pd.DataFrame, child_tables: dict[str, pd.DataFrame],
+                   repo_df: pd.DataFrame | None) -> pd.DataFrame:
+    """Attach per-PR activity counts and the repository's star count."""
+    pr_df = pr_df.copy()
+    for column, (table, value) in PR_ACTIVITY.items():
+        child = child_tables[table]
+        grouped = child.groupby("pr_id").size() if value is None else child.groupby("pr_id")[value].sum()
+        pr_df[column] = pr_df["id"].map(grouped).fillna(0).astype(np.int32)
+    if repo_df is not None and "repo_url" in pr_df.columns:
+        stars = repo_df.drop_duplicates("url").set_index("url")["stars"]
+        pr_df["repo_stars"] = pr_df["repo_url"].map(stars)
+    return pr_df
+
+
+# =============================================================================
+# Server
+# =============================================================================
+class AIDevServer(flight.FlightServerBase):
+    """
+    Flight server holding the preprocessed tables.
+
+    A ticket is JSON: {"table": str, "columns": [...], "where": {col: [values]},
+    "range": {col: [lo, hi]}, "not_null": [cols]} where `lo`/`hi` may be null
+    and bounds are inclusive.
+    """
+
+    def __init__(self, location: str = DEFAULT_LOCATION, *, derive_metrics: bool = True,
+                 **kwargs) -> None:
+        super().__init__(location, **kwargs)
+        self._tables: dict[str, pa.Table] = {}
+        self._lock = threading.Lock()
+        self._derive_metrics = derive_metrics
+        self.load()
+
+    # --- loading -------------------------------------------------------------
+    def load(self) -> None:
+        frames = {name: preprocess(load_table(name)) for name in EAGER_TABLES}
+        if self._derive_metrics:
+            columns: dict[str, list[str]] = {}
+            for table, value in PR_ACTIVITY.values():
+                columns.setdefault(table, ["pr_id"]).extend([value] if value else [])
+            children = {table: load_table(table, columns=cols) for table, cols in columns.items()}
+            frames["pull_request"] = add_pr_metrics(frames["pull_request"], children,
+                                                    frames["repository"])
+        with self._lock:
+            self._tables = {name: pa.Table.from_pandas(df, preserve_index=False)
+                            for name, df in frames.items()}
+        print(f"✓ Loaded {', '.join(f'{n} ({t.num_rows:,})' for n, t in self._tables.items())}")
+
+    def table(self, name: str) -> pa.Table:
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = pa.Table.from_pandas(preprocess(load_table(name)),
+                                                          preserve_index=False)
+            return self._tables[name]
+
+    # --- query ---------------------------------------------------------------
+    def query(self, request: dict) -> pa.Table:
+        table = self.table(request["table"])
+        mask = None
+        for col, values in (request.get("where") or {}).items():
+            cond = pc.is_in(table[col], value_set=pa.array(values))
+            mask = cond if mask is None else pc.and_(mask, cond)
+        for col, (lo, hi) in (request.get("range") or {}).items():
+            if lo is not None:
+                cond = pc.greater_equal(table[col], lo)
+                mask = cond if mask is None else pc.and_(mask, cond)
+            if hi is not None:
+                cond = pc.less_equal(table[col], hi)
+                mask = cond if mask is None else pc.and_(mask, cond)
+        for col in request.get("not_null") or []:
+            cond = pc.is_valid(table[col])
+            mask = cond if mask is None else pc.and_(mask, cond)
+        if mask is not None:
+            table = table.filter(mask, null_selection_behavior="drop")
+        if request.get("columns"):
+            table = table.select(request["columns"])
+        return table
+
+    # --- Flight endpoints ----------------------------------------------------
+    def do_get(self, context, ticket):
+        return flight.RecordBatchStream(self.query(json.loads(ticket.ticket)))
+
+    def list_flights(self, context, criteria):
+        with self._lock:
+            tables = dict(self._tables)
+        for name, table in tables.items():
+            descriptor = flight.FlightDescriptor.for_path(name)
+            endpoint = flight.FlightEndpoint(json.dumps({"table": name}).encode(), [])
+            yield flight.FlightInfo(table.schema, descriptor, [endpoint], table.num_rows, table.nbytes)
+
+    def list_actions(self, context):
+        return [("reload", "Reload and re-preprocess all tables"),
+                ("drop", "Drop a lazily loaded table (body: table name)")]
+
+    def do_action(self, context, action):
+        if action.type == "reload":
+            self.load()
+        elif action.type == "drop":
+            with self._lock:
+                self._tables.pop(action.body.to_pybytes().decode(), None)
+        else:
+            raise KeyError(f"unknown action {action.type!r}")
+        return iter([])
+
+
+# =============================================================================
+# Client
+# =============================================================================
+@dataclass(frozen=True)
+class HFData:
+    """Same bundle as `HFData` in productivity.ipynb."""
+    pr_df: pd.DataFrame
+    lbl_df: pd.DataFrame
+    repo_df: pd.DataFrame | None
+
+
+class DataClient:
+    """Thin Flight client exposing the notebooks' loader signatures."""
+
+    def __init__(self, location: str = DEFAULT_LOCATION) -> None:
+        self._client = flight.connect(location)
+
+    def table(self, name: str, columns: Sequence[str] | None = None,
+              where: dict[str, Sequence] | None = None,
+              bounds: dict[str, tuple] | None = None,
+              not_null: Sequence[str] | None = None) -> pd.DataFrame:
+        """Fetch a table; *where* keeps rows whose column is in a value list,
+        *bounds* keeps rows within inclusive (lo, hi) limits (None = open),
+        *not_null* drops rows where any of those columns is missing."""
+        request = {"table": name, "columns": list(columns) if columns else None,
+                   "where": where, "range": bounds, "not_null": list(not_null or [])}
+        reader = self._client.do_get(flight.Ticket(json.dumps(request, default=str).encode()))
+        return reader.read_all().to_pandas()
+
+    def tables(self) -> dict[str, int]:
+        """Tables currently resident on the server and their row counts."""
+        return {info.descriptor.path[0].decode(): info.total_records
+                for info in self._client.list_flights()}
+
+    def reload(self) -> None:
+        list(self._client.do_action(flight.Action("reload", b"")))
+
+    # --- notebook loaders ----------------------------------------------------
+    def load_hf_data(self, *, stars_range: Sequence | None = None,
+                     include_repo: bool = False) -> HFData:
+        """Server-backed equivalent of `load_hf_data` in productivity.ipynb."""
+        bounds, not_null = None, None
+        if stars_range is not None:
+            if not (isinstance(stars_range, (list, tuple)) and len(stars_range) == 2):
+                raise ValueError("stars_range must be a 2-element list or tuple: [lower, upper]")
+            # like the notebook, any star range drops PRs without a known star count
+            bounds, not_null = {"repo_stars": tuple(stars_range)}, ["repo_stars"]
+        pr_ai = self.table("pull_request", bounds=bounds, not_null=not_null)
+        pr_all = pd.concat([pr_ai, self.table("human_pull_request")], ignore_index=True)
+        # like the notebook, labels are returned for every PR, not only the star range
+        lbl_ai = self.table("pr_task_type")
+        lbl_all = pd.concat([lbl_ai, self.table("human_pr_task_type")], ignore_index=True)
+        repo_df = self.table("repository") if (include_repo or stars_range is not None) else None
+        return HFData(pr_df=pr_all, lbl_df=lbl_all, repo_df=repo_df)
+
+    def load_repo_meta(self, agent: str) -> pd.DataFrame:
+        """Server-backed equivalent of `load_repo_meta` in language_usage.ipynb."""
+        urls = self.table("pull_request", columns=["repo_url"], where={"agent": [agent]})["repo_url"]
+        if urls.empty:
+            raise FileNotFoundError(f"No PRs found for agent {agent}")
+        return self.table("repository", where={"url": urls.dropna().unique().tolist()})
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve")
+    serve.add_argument("--location", default=DEFAULT_LOCATION)
+    serve.add_argument("--no-metrics", action="store_true",
+                       help="skip per-PR activity metrics (faster start)")
+    status = sub.add_parser("status")
+    status.add_argument("--location", default=DEFAULT_LOCATION)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        server = AIDevServer(args.location, derive_metrics=not args.no_metrics)
+        print("Serving on", args.location)
+        server.serve()
+    else:
+        for name, rows in DataClient(args.location).tables().items():
+            print(f"{name:<24} {rows:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Shared plumbing for the figure scripts: registration, freshness stamps and
+lazy plotting setup.
+
+Importing pandas, numpy and matplotlib costs most of a second before any
+data is touched, so the scripts are organised around a registry instead of
+top-level code:
+
+- each figure is a function registered with the tables it reads;
+- tables and derived metrics live on a lazy `data` object and are loaded on
+  first access, so rendering one figure reads only what it needs;
+- listing figures and checking freshness use only the standard library
+  (digests of the script and the shared data modules plus
+  `aidev_data.source_fingerprint` of each table); on hf:// data the table
+  fingerprints are hub requests, cached for AIDEV_FINGERPRINT_TTL seconds;
+- matplotlib is imported on the render path only, with the non-interactive
+  Agg backend selected before the import.
+
+Every figure script gets the same command line:
+    python regenerate_individual_figures.py            # render stale figures
+    python regenerate_individual_figures.py --list
+    python regenerate_individual_figures.py --check    # exit 1 if anything is stale
+    python regenerate_individual_figures.py --only 07_pr_title_length_histogram --force
+    python regenerate_individual_figures.py --sample 0.05      # preview into figures_preview/
+
+Preview runs (--sample, or AIDEV_SAMPLE in the environment) draw an
+agent-stratified PR sample with all rows those PRs reference (see
+aidev_data.SampleSpec) and never touch the report's figures or stamps.
+"""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import aidev_data
+from aidev_data import source_fingerprint, table_path
+
+# shared modules whose code changes every figure: loaders, compact dtypes, this file
+SHARED_CODE = tuple(Path(__file__).resolve().with_name(name)
+                    for name in ("figure_tools.py", "aidev_data.py", "compact_schema.py"))
+
+FIGURE_DIR = Path("figures_individual")
+PREVIEW_DIR = Path("figures_preview")
+
+# publication defaults shared by every figure script
+RC_PARAMS = {
+    "figure.figsize": (12, 8),
+    "font.size": 14,
+    "axes.labelsize": 16,
+    "axes.titlesize": 18,
+    "xtick.labelsize": 13,
+    "ytick.labelsize": 13,
+    "legend.fontsize": 13,
+}
+
+
+def setup_plotting(style: str | None = None, rc: dict | None = None):
+    """
+    Import pyplot (Agg backend) and apply *style* and the shared rcParams.
+
+    *style* names a matplotlib style sheet; "seaborn-v0_8-whitegrid" gives the
+    look of `sns.set_style("whitegrid")` without importing seaborn.
+    """
+    import matplotlib.pyplot as plt
+
+    if style:
+        plt.style.use(style)
+    plt.rcParams.update(RC_PARAMS if rc is None else rc)
+    return plt
+
+
+def _digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@dataclass(frozen=True)
+class Figure:
+    """One registered figure; *name* is the output file stem."""
+    name: str
+    render: Callable
+    tables: tuple[str, ...]
+    title: str
+
+
+class FigureRegistry:
+    """
+    Ordered collection of the figures produced by one script.
+
+    Args:
+        script: The script's `__file__`; its digest is part of every stamp.
+        data: Factory for the lazy data object passed to each figure.
+        setup: Called once before the first figure is rendered; returns pyplot
+            and binds the script's heavy module globals.
+        banner: Heading printed when rendering starts.
+    """
+
+    def __init__(self, script: str, *, data: Callable[[], object],
+                 setup: Callable[[], object], banner: str = "") -> None:
+        self.script = Path(script).resolve()
+        self.figures: list[Figure] = []
+        self._data = data
+        self._setup = setup
+        self.banner = banner
+
+    @property
+    def directory(self) -> Path:
+        return FIGURE_DIR if aidev_data.SAMPLE is None else PREVIEW_DIR
+
+    @property
+    def stamp_file(self) -> Path:
+        return self.directory / f".{self.script.stem}.stamps.json"
+
+    def path(self, figure: Figure) -> Path:
+        return self.directory / f"{figure.name}.png"
+
+    def figure(self, name: str, *, tables: tuple[str, ...], title: str = ""):
+        """Register the decorated function as figure *name*.
+
+        The function draws on the current pyplot figure and may return False
+        to skip (e.g. when an optional column is absent); saving is done here.
+        """
+        def decorator(fn: Callable) -> Callable:
+            self.figures.append(Figure(name, fn, tuple(tables), title or fn.__doc__ or name))
+            return fn
+        return decorator
+
+    # --- freshness -----------------------------------------------------------
+    def _stamps(self) -> dict[str, str]:
+        try:
+            return json.loads(self.stamp_file.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def stamp(self, figure: Figure, code: str, tables: dict[str, str]) -> str:
+        h = hashlib.sha256(code.encode())
+        h.update(repr(aidev_data.SAMPLE).encode())
+        for name in figure.tables:
+            h.update(f"{name}={tables[name]}".encode())
+        return h.hexdigest()
+
+    def stale(self, figures: list[Figure]) -> tuple[list[Figure], dict[str, str]]:
+        """Figures whose output is missing or whose code / input tables changed."""
+        code = "".join(_digest(path) for path in (self.script, *SHARED_CODE))
+        fingerprints = {name: source_fingerprint(table_path(name))
+                        for name in sorted({t for f in figures for t in f.tables})}
+        stamps = self._stamps()
+        new = {f.name: self.stamp(f, code, fingerprints) for f in figures}
+        return [f for f in figures
+                if stamps.get(f.name) != new[f.name] or not self.path(f).exists()], new
+
+    # --- rendering -----------------------------------------------------------
+    def render(self, figures: list[Figure], stamps: dict[str, str]) -> None:
+        plt = self._setup()
+        data = self._data()
+        saved = self._stamps()
+        if self.banner:
+            print("=" * 80)
+            print(self.banner)
+            print("=" * 80)
+        for figure in figures:
+            print(f"Generating {figure.name}: {figure.title}...")
+            if figure.render(data) is False:
+                plt.close("all")
+                print(f"  skipped {figure.name}")
+                continue
+            plt.tight_layout()
+            plt.savefig(self.path(figure), dpi=300, bbox_inches="tight")
+            plt.close("all")
+            saved[figure.name] = stamps[figure.name]
+            # stamps are written per figure so an interrupted run keeps its progress
+            self.stamp_file.write_text(json.dumps(saved, indent=1, sort_keys=True))
+            print(f"✓ {figure.name}.png")
+
+    def main(self, argv: list[str] | None = None) -> int:
+        parser = argparse.ArgumentParser(description=self.banner or None)
+        parser.add_argument("--list", action="store_true", help="list figures and exit")
+        parser.add_argument("--check", action="store_true",
+                            help="report stale figures; exit status 1 if any")
+        parser.add_argument("--only", action="append", metavar="NAME",
+                            help="restrict to figures whose name starts with NAME (repeatable)")
+        parser.add_argument("--force", action="store_true", help="render even if up to date")
+        parser.add_argument("--sample", type=float, metavar="FRACTION",
+                            help="preview on an agent-stratified sample of PRs")
+        parser.add_argument("--spread", metavar="COLUMN",
+                            help="with --sample, spread each agent's picks over COLUMN (e.g. repo_url)")
+        parser.add_argument("--seed", type=int, default=0, help="with --sample, which sample to draw")
+        args = parser.parse_args(argv)
+        if args.sample is not None:
+            aidev_data.set_sample(aidev_data.SampleSpec(args.sample, spread=args.spread, seed=args.seed))
+
+        figures = self.figures
+        if args.only:
+            figures = [f for f in figures if any(f.name.startswith(p) for p in args.only)]
+            if not figures:
+                parser.error(f"no figure matches {', '.join(args.only)}")
+        if args.list:
+            for f in figures:
+                print(f"{f.name:<48} {f.title}  [{', '.join(f.tables)}]")
+            return 0
+
+        start = time.perf_counter()
+        stale, stamps = self.stale(figures)
+        if args.check:
+            for f in stale:
+                print("stale", f.name)
+            print(f"{len(stale)} of {len(figures)} figures stale")
+            return 1 if stale else 0
+        todo = figures if args.force else stale
+        if not todo:
+            print(f"✓ {len(figures)} figures up to date ({time.perf_counter() - start:.2f}s)")
+            return 0
+        self.directory.mkdir(exist_ok=True)
+        self.render(todo, stamps)
+        print(f"\n✓ Rendered {len(todo)} of {len(figures)} figures to {self.directory}/ "
+              f"in {time.perf_counter() - start:.1f}s")
+        return 0
+
+    def run(self) -> None:
+        sys.exit(self.main())
@@ -0,0 +1,146 @@
+"""
+Per-repository learning curves (Figure 6): do agents get merged more often
+as they submit more PRs to the same repository?
+
+All steps are vectorized over the full PR table:
+
+- ordinals: one stable sort by (agent, repo, created_at), then
+  `groupby.cumcount`;
+- expanding and rolling merge rates: a single cumulative sum of the merge
+  flag, differenced at each PR's window start;
+- confidence bands: cluster bootstrap over repositories, drawn as a
+  (replicates x repos) multinomial weight matrix and reduced with one
+  matrix product per batch.
+
+Usage:
+    python learning_curves.py
+    python learning_curves.py --table all_pull_request --replicates 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from aidev_data import load_table
+
+GROUP_COLS = ("agent", "repo_url")
+
+# PR ordinal within (agent, repo), binned so late positions are not too sparse
+ORDINAL_BINS = [0, 1, 2, 3, 5, 10, 20, np.inf]
+ORDINAL_LABELS = ["1", "2", "3", "4-5", "6-10", "11-20", ">20"]
+
+
+def add_ordinals(pr_df: pd.DataFrame, *, window: int = 10,
+                 group_cols: tuple[str, ...] = GROUP_COLS) -> pd.DataFrame:
+    """
+    Sort PRs within each (agent, repo) and attach position and merge-rate columns.
+
+    Adds `ordinal` (1-based), `is_merged`, `expanding_merge_rate` (merge
+    rate of PRs 1..ordinal) and `rolling_merge_rate` (last *window* PRs).
+    PRs with a missing agent or repository have no position and are dropped.
+    """
+    df = pr_df.dropna(subset=list(group_cols))
+    df["created_at"] = pd.to_datetime(df["created_at"], utc=True, errors="coerce")
+    df["is_merged"] = df["merged_at"].notna()
+    df = df.sort_values([*group_cols, "created_at"], kind="stable").reset_index(drop=True)
+
+    position = df.groupby(list(group_cols), sort=False, observed=True).cumcount().to_numpy()
+    df["ordinal"] = (position + 1).astype(np.int32)
+
+    merged = df["is_merged"].to_numpy(dtype=np.int64)
+    cumsum = np.r_[0, np.cumsum(merged)]
+    idx = np.arange(len(df))
+    group_start = idx - position
+    window_start = idx - np.minimum(position, window - 1)
+    df["expanding_merge_rate"] = ((cumsum[idx + 1] - cumsum[group_start]) / (position + 1)).astype(np.float32)
+    df["rolling_merge_rate"] = ((cumsum[idx + 1] - cumsum[window_start])
+                                / (idx + 1 - window_start)).astype(np.float32)
+    df["ordinal_bin"] = pd.cut(df["ordinal"], ORDINAL_BINS, labels=ORDINAL_LABELS)
+    return df
+
+
+def _repo_bin_counts(sub: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """(repos x bins) matrices of merged PRs and total PRs."""
+    sub = sub[sub["repo_url"].notna()]
+    repo_codes, _ = pd.factorize(sub["repo_url"])
+    bin_codes = sub["ordinal_bin"].cat.codes.to_numpy()
+    shape = (repo_codes.max() + 1, len(ORDINAL_LABELS))
+    flat = repo_codes * shape[1] + bin_codes
+    size = shape[0] * shape[1]
+    total = np.bincount(flat, minlength=size).reshape(shape).astype(np.float64)
+    merged = np.bincount(flat, weights=sub["is_merged"].to_numpy(np.float64),
+                         minlength=size).reshape(shape)
+    return merged, total
+
+
+def bootstrap_bands(merged: np.ndarray, total: np.ndarray, *, replicates: int = 1000,
+                    level: float = 0.95, batch: int = 200,
+                    rng: np.random.Generator | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Repository-clustered bootstrap of the per-bin merge rate.
+
+    Each replicate resamples repositories with replacement; a replicate is a
+    multinomial weight vector over repos, so a batch of replicates is one
+    (batch x repos) @ (repos x bins) product.
+    """
+    rng = rng or np.random.default_rng(0)
+    n_repos = merged.shape[0]
+    rates = np.empty((replicates, merged.shape[1]))
+    probs = np.full(n_repos, 1.0 / n_repos)
+    for start in range(0, replicates, batch):
+        stop = min(start + batch, replicates)
+        weights = rng.multinomial(n_repos, probs, size=stop - start).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates[start:stop] = (weights @ merged) / (weights @ total)
+    alpha = (1.0 - level) / 2.0
+    with warnings.catch_warnings():  # empty bins stay NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        low, high = np.nanquantile(rates, [alpha, 1.0 - alpha], axis=0)
+    return low, high
+
+
+def learning_curves(pr_df: pd.DataFrame, *, replicates: int = 1000, level: float = 0.95,
+                    seed: int = 0) -> pd.DataFrame:
+    """Merge rate per (agent, ordinal bin) with bootstrap confidence bands."""
+    if "ordinal_bin" not in pr_df.columns:
+        pr_df = add_ordinals(pr_df)
+    rng = np.random.default_rng(seed)
+    frames = []
+    for agent, sub in pr_df.groupby("agent", sort=True, observed=True):
+        merged, total = _repo_bin_counts(sub)
+        n = total.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = merged.sum(axis=0) / n
+        low, high = bootstrap_bands(merged, total, replicates=replicates, level=level, rng=rng)
+        frames.append(pd.DataFrame({"agent": agent, "ordinal_bin": ORDINAL_LABELS, "prs": n.astype(int),
+                                    "merge_rate": rate, "ci_low": low, "ci_high": high}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def improvement(curves: pd.DataFrame, early: str = "1", late: str = "6-10") -> pd.Series:
+    """Merge-rate change between an early and a late ordinal bin, per agent."""
+    pivot = curves.pivot(index="agent", columns="ordinal_bin", values="merge_rate")
+    return (pivot[late] - pivot[early]).rename(f"delta_{early}_to_{late}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--table", default="pull_request")
+    parser.add_argument("--replicates", type=int, default=1000)
+    parser.add_argument("--window", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    pr_df = load_table(args.table, columns=["id", "agent", "repo_url", "created_at", "merged_at"])
+    pr_df["agent"] = pr_df["agent"].astype("category")
+    curves = learning_curves(add_ordinals(pr_df, window=args.window), replicates=args.replicates)
+    print(curves.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print("\nChange in merge rate (PR #1 -> PRs #6-10):")
+    print((improvement(curves) * 100).round(1).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Materialized aggregate cube over agent x task type x month x language x
+repository-star band.
+
+Every cell holds additive measures only (counts and sums), so any roll-up or
+slice is a filter plus a `groupby.sum` over a few thousand cells instead of a
+pass over the raw tables. Ratios (merge rate, mean turnaround, lines per PR)
+are derived after aggregation. Medians and distinct counts (e.g. repositories
+per language) are not additive and still need the raw rows.
+
+The per-PR facts come from the incremental ingest store (incremental_ingest.py),
+joined with `pr_task_type` labels and the repository's language and stars.
+
+Star bands are half-open: "100-499" holds 100 <= stars < 500, i.e. the
+inclusive range [100, 499]. The notebooks' `stars_range=[lo, hi]` is
+inclusive at both ends, so `stars_range=[100, 500]` also keeps repositories
+with exactly 500 stars, which the cube counts in "500-999".
+
+Usage:
+    python olap_cube.py build
+    python olap_cube.py query --by agent task_type --where star_band=100-499,500-999
+    python olap_cube.py query --by agent month --cumulative month --measures prs merged
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from aidev_data import load_table
+from incremental_ingest import STATE_DIR, ingest, load_pr_metrics
+
+CUBE_PATH = Path(__file__).resolve().parent.parent / "build" / "cube.parquet"
+
+SECONDS_TO_HOUR = 3600
+
+DIMENSIONS = ["agent", "task_type", "month", "language", "star_band"]
+
+# repository stars; bands are half-open [lo, hi), see the module docstring
+STAR_BINS = [0, 10, 100, 500, 1000, 5000, np.inf]
+STAR_LABELS = ["<10", "10-99", "100-499", "500-999", "1k-5k", "5k+"]
+
+MEASURES = {
+    "prs": np.int32,
+    "open": np.int32,
+    "merged": np.int32,
+    "closed": np.int32,              # closed without merge
+    "turnaround_hours": np.float64,  # sum over merged + closed PRs
+    "merged_turnaround_hours": np.float64,
+    "additions": np.int64,
+    "deletions": np.int64,
+    "files_changed": np.int64,
+    "commits": np.int32,
+    "comments": np.int32,
+    "reviews": np.int32,
+    "review_comments": np.int32,
+}
+
+# derived measure -> (numerator, denominator(s))
+RATIOS = {
+    "merge_rate": ("merged", ("prs",)),
+    "mean_turnaround_hours": ("turnaround_hours", ("merged", "closed")),
+    "mean_merged_turnaround_hours": ("merged_turnaround_hours", ("merged",)),
+    "additions_per_pr": ("additions", ("prs",)),
+    "comments_per_pr": ("comments", ("prs",)),
+}
+
+
+# =============================================================================
+# Build
+# =============================================================================
+def pr_facts(pr_metrics: pd.DataFrame, labels: pd.DataFrame,
+             repos: pd.DataFrame) -> pd.DataFrame:
+    """One row per PR: the five dimensions plus its measure contributions."""
+    prs = pr_metrics.reset_index()
+    created = pd.to_datetime(prs["created_at"], utc=True, errors="coerce")
+    merged_at = pd.to_datetime(prs["merged_at"], utc=True, errors="coerce")
+    closed_at = pd.to_datetime(prs["closed_at"], utc=True, errors="coerce")
+    is_open = (prs["state"].astype(str).str.lower() == "open").to_numpy()
+    is_merged = merged_at.notna().to_numpy() & ~is_open
+    hours = ((merged_at.fillna(closed_at) - created).dt.total_seconds() / SECONDS_TO_HOUR).to_numpy()
+    resolved = ~is_open & ~np.isnan(hours)
+
+    task = labels.drop_duplicates("id").set_index("id")["type"].astype(str).str.strip()
+    repo = repos.drop_duplicates("url").set_index("url")
+    stars = prs["repo_url"].map(repo["stars"])
+
+    facts = pd.DataFrame({
+        "agent": prs["agent"].astype(str),
+        "task_type": prs["pr_id"].map(task).fillna("unlabeled"),
+        "month": created.dt.strftime("%Y-%m").fillna("unknown"),
+        "language": prs["repo_url"].map(repo["language"]).fillna("Unknown"),
+        "star_band": pd.cut(stars, STAR_BINS, labels=STAR_LABELS, right=False)
+                       .cat.add_categories("unknown").fillna("unknown"),
+        "prs": 1,
+        "open": is_open.astype(int),
+        "merged": is_merged.astype(int),
+        "closed": (~is_open & ~is_merged).astype(int),
+        "turnaround_hours": np.where(resolved, hours, 0.0),
+        "merged_turnaround_hours": np.where(is_merged & resolved, hours, 0.0),
+    })
+    for measure in ("additions", "deletions", "files_changed", "commits", "comments",
+                    "reviews", "review_comments"):
+        facts[measure] = prs[measure].to_numpy()
+    return facts
+
+
+def build_cube(facts: pd.DataFrame) -> pd.DataFrame:
+    """Collapse per-PR facts into cells with categorical dimensions."""
+    cells = facts.groupby(DIMENSIONS, observed=True, sort=False)[list(MEASURES)].sum().reset_index()
+    for dim in DIMENSIONS:
+        values = cells[dim].astype(str)
+        if dim == "star_band":
+            categories = [c for c in [*STAR_LABELS, "unknown"] if c in set(values)]
+        else:
+            categories = sorted(values.unique())
+        cells[dim] = pd.Categorical(values, categories=categories,
+                                    ordered=dim in ("month", "star_band"))
+    return cells.astype(MEASURES).sort_values(DIMENSIONS, ignore_index=True)
+
+
+def _bound_code(categories: pd.Index, value: str, dim: str, side: str) -> int:
+    """
+    Category code where an inclusive range bound *value* cuts *categories*.
+
+    side="left" gives the first code >= value and side="right" the first code
+    > value. Non-members are placed with `searchsorted`, which needs members
+    that sort as strings in category order.
+    """
+    if value in categories:
+        code = categories.get_loc(value)
+        return code if side == "left" else code + 1
+    members = categories.to_numpy(dtype=object)
+    if not (members[:-1] < members[1:]).all():
+        raise ValueError(f"{value!r} is not a {dim} member; expected one of {list(members)}")
+    return int(np.searchsorted(members, value, side=side))
+
+
+class Cube:
+    """Query interface over the materialized cells."""
+
+    def __init__(self, cells: pd.DataFrame) -> None:
+        self.cells = cells
+
+    @classmethod
+    def build(cls, base: str | None = None, state: Path = STATE_DIR) -> "Cube":
+        """Build from the ingest store in *state*; run `ingest` first to refresh it."""
+        labels = load_table("pr_task_type", columns=["id", "type"], base=base)
+        repos = load_table("repository", columns=["url", "language", "stars"], base=base)
+        return cls(build_cube(pr_facts(load_pr_metrics(state), labels, repos)))
+
+    @classmethod
+    def load(cls, path: Path = CUBE_PATH) -> "Cube":
+        return cls(pd.read_parquet(path))
+
+    def save(self, path: Path = CUBE_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.cells.to_parquet(path, index=False)
+
+    def members(self, dim: str) -> list[str]:
+        """Values of dimension *dim* present in the cube, in order."""
+        return list(self.cells[dim].cat.categories)
+
+    def query(self, by: Sequence[str] = (), *,
+              where: dict[str, str | Sequence[str]] | None = None,
+              between: dict[str, tuple[str | None, str | None]] | None = None,
+              measures: Sequence[str] | None = None,
+              cumulative: str | None = None,
+              ratios: bool = True) -> pd.DataFrame:
+        """
+        Roll up to the dimensions in *by* after slicing.
+
+        Args:
+            by: Dimensions to keep; the rest are summed out.
+            where: dimension -> member or list of members to keep.
+            between: Inclusive (lo, hi) range on an ordered dimension (month,
+                star_band); None leaves that side open. Bounds need not be
+                members on a dimension whose members sort as strings (month:
+                "2025-02-15" starts the range at March). "unknown" cells
+                fall outside every range.
+            measures: Additive measures to return (default: all).
+            cumulative: A dimension in *by* (usually "month") along which
+                measures are accumulated within the other groups.
+            ratios: Append the derived ratios whose inputs are selected.
+        """
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+        for dim, members in (where or {}).items():
+            members = [members] if isinstance(members, str) else list(members)
+            mask &= cells[self._dim(dim)].isin(members).to_numpy()
+        for dim, (lo, hi) in (between or {}).items():
+            column = cells[self._dim(dim)]
+            if not column.cat.ordered:
+                raise ValueError(f"dimension {dim!r} is not ordered")
+            codes = column.cat.codes.to_numpy()
+            mask &= (codes >= 0) & (column != "unknown").to_numpy()
+            if lo is not None:
+                mask &= codes >= _bound_code(column.cat.categories, lo, dim, "left")
+            if hi is not None:
+                mask &= codes <= _bound_code(column.cat.categories, hi, dim, "right") - 1
+        cells = cells[mask]
+
+        wanted = list(measures or MEASURES)
+        needed = list(dict.fromkeys([*wanted, *(c for num, den in RATIOS.values()
+                                                for c in (num, *den) if ratios and num in wanted)]))
+        by = [self._dim(d) for d in by]
+        if by:
+            out = cells.groupby(by, observed=True, sort=True)[needed].sum()
+        else:
+            out = cells[needed].sum().to_frame().T
+        if cumulative:
+            others = [d for d in by if d != cumulative]
+            out = out.groupby(level=others, observed=True).cumsum() if others else out.cumsum()
+        if ratios:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                for name, (num, den) in RATIOS.items():
+                    if num in wanted:
+                        out[name] = out[num] / out[list(den)].sum(axis=1).replace(0, np.nan)
+        return out[[c for c in out.columns if c in wanted or c in RATIOS]]
+
+    def _dim(self, dim: str) -> str:
+        if dim not in DIMENSIONS:
+            raise KeyError(f"unknown dimension {dim!r}; expected one of {DIMENSIONS}")
+        return dim
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build")
+    build.add_argument("--base", help="snapshot location (default: AIDEV_DATA_DIR / Hugging Face)")
+    build.add_argument("--out", type=Path, default=CUBE_PATH)
+    query = sub.add_parser("query")
+    query.add_argument("--cube", type=Path, default=CUBE_PATH)
+    query.add_argument("--by", nargs="*", default=[])
+    query.add_argument("--where", action="append", default=[], metavar="DIM=A,B",
+                       help="keep only these members (repeatable)")
+    query.add_argument("--measures", nargs="*")
+    query.add_argument("--cumulative", metavar="DIM")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        ingest(args.base)
+        cube = Cube.build(args.base)
+        cube.save(args.out)
+        print(f"✓ {len(cube.cells):,} cells from {int(cube.cells['prs'].sum()):,} PRs "
+              f"in {time.perf_counter() - start:.1f}s")
+        print("Wrote", args.out)
+    else:
+        cube = Cube.load(args.cube)
+        where = dict(item.split("=", 1) for item in args.where)
+        start = time.perf_counter()
+        result = cube.query(args.by, where={k: v.split(",") for k, v in where.items()},
+                            measures=args.measures, cumulative=args.cumulative)
+        elapsed = time.perf_counter() - start
+        print(result.to_string(float_format=lambda v: f"{v:,.2f}"))
+        print(f"\n({len(result)} rows, {elapsed * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Compressed, indexed store for the `patch` column of pr_commit_details.
+
+`load_AIDev.ipynb` selects merged-PR patches with
+`pr_commit_details_df['pr_id'].isin(merged_pr_ids)`, which needs the whole
+711k-row table, patches included, in memory. This store writes the patches
+once, in file order, into independently compressed zstd chunks (optionally
+sharing a trained dictionary), plus an index of (pr_id, sha, filename) ->
+(chunk, offset, length). Readers then fetch one PR's patches by
+decompressing only the chunks that hold them, or stream a selection of PRs
+chunk by chunk.
+
+`diff_stats` computes per-patch hunks, added/removed lines and added/removed
+whitespace-delimited tokens directly on each decompressed chunk buffer with
+NumPy, without splitting patches into Python strings.
+
+Requires the `zstandard` package (`pip install zstandard`).
+
+Usage:
+    python patch_store.py build --out build/patches --dict
+    python patch_store.py stats --store build/patches --merged-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from aidev_data import iter_batches, load_table, table_path
+
+INDEX_FILE = "index.parquet"
+DICT_FILE = "patches.dict"
+META_FILE = "meta.json"
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as exc:  # optional dependency, only needed here
+        raise ImportError("patch_store requires zstandard: pip install zstandard") from exc
+    return zstandard
+
+
+def _chunk_path(directory: Path, chunk: int) -> Path:
+    return directory / "chunks" / f"chunk_{chunk:05d}.zst"
+
+
+# =============================================================================
+# Writing
+# =============================================================================
+def build_store(frames: Iterable[pd.DataFrame], directory: str | Path, *,
+                chunk_bytes: int = 1 << 20, level: int = 10,
+                dict_size: int = 0, dict_samples: int = 20_000) -> Path:
+    """
+    Write patches from *frames* (`pr_id`, `filename`, `patch`, optional `sha`).
+
+    Args:
+        frames: DataFrame chunks, e.g. `aidev_data.iter_batches(...)`.
+        directory: Output directory; overwritten chunk files keep their names.
+        chunk_bytes: Uncompressed bytes per chunk; smaller chunks make single
+            PR lookups cheaper, larger chunks compress better.
+        level: zstd compression level.
+        dict_size: Train a shared dictionary of this many bytes on the first
+            *dict_samples* patches (0 disables). Dictionaries mostly pay off
+            for small chunks.
+    """
+    zstd = _zstd()
+    directory = Path(directory)
+    (directory / "chunks").mkdir(parents=True, exist_ok=True)
+
+    frames = iter(frames)
+    pending: list[pd.DataFrame] = []
+    dictionary = None
+    if dict_size:
+        samples: list[bytes] = []
+        for frame in frames:
+            pending.append(frame)
+            samples.extend(p.encode() for p in frame["patch"].dropna().head(dict_samples - len(samples)))
+            if len(samples) >= dict_samples:
+                break
+        # nothing to train on (no patches at all): write the store without one
+        if samples:
+            try:
+                dictionary = zstd.train_dictionary(dict_size, samples)
+            except zstd.ZstdError as exc:
+                raise ValueError(f"cannot train a {dict_size}-byte dictionary on {len(samples)} "
+                                 f"patches; build without dict_size") from exc
+            (directory / DICT_FILE).write_bytes(dictionary.as_bytes())
+    if dictionary is None:
+        (directory / DICT_FILE).unlink(missing_ok=True)  # left over from an earlier build
+    compressor = zstd.ZstdCompressor(level=level, dict_data=dictionary)
+
+    index_parts: list[pd.DataFrame] = []
+    buffer: list[bytes] = []
+    buffered = 0
+    chunk = 0
+
+    def flush() -> None:
+        nonlocal buffer, buffered, chunk
+        if buffer:
+            _chunk_path(directory, chunk).write_bytes(compressor.compress(b"".join(buffer)))
+            chunk += 1
+            buffer, buffered = [], 0
+
+    def all_frames() -> Iterator[pd.DataFrame]:
+        yield from pending
+        yield from frames
+
+    for frame in all_frames():
+        frame = frame[frame["patch"].notna()]
+        if frame.empty:
+            continue
+        encoded = [p.encode() for p in frame["patch"]]
+        chunks = np.empty(len(encoded), dtype=np.int32)
+        offsets = np.empty(len(encoded), dtype=np.int64)
+        for i, data in enumerate(encoded):
+            if buffered and buffered + len(data) > chunk_bytes:
+                flush()
+            chunks[i], offsets[i] = chunk, buffered
+            buffer.append(data)
+            buffered += len(data)
+        part = pd.DataFrame({
+            "pr_id": frame["pr_id"].to_numpy(),
+            "sha": frame["sha"].to_numpy() if "sha" in frame.columns else None,
+            "filename": frame["filename"].to_numpy(),
+            "chunk": chunks,
+            "offset": offsets,
+            "length": np.fromiter((len(d) for d in encoded), dtype=np.int32, count=len(encoded)),
+        })
+        index_parts.append(part)
+    flush()
+
+    index = pd.concat(index_parts, ignore_index=True) if index_parts else pd.DataFrame(
+        columns=["pr_id", "sha", "filename", "chunk", "offset", "length"])
+    index = index.sort_values(["pr_id", "chunk", "offset"], kind="stable").reset_index(drop=True)
+    index.to_parquet(directory / INDEX_FILE, index=False)
+    (directory / META_FILE).write_text(json.dumps({
+        "chunks": chunk, "patches": len(index), "level": level,
+        "chunk_bytes": chunk_bytes, "dictionary": bool(dictionary),
+    }, indent=2))
+    return directory
+
+
+# =============================================================================
+# Reading
+# =============================================================================
+class PatchStore:
+    """Random and streaming access to a store written by `build_store`."""
+
+    def __init__(self, directory: str | Path, cache_chunks: int = 8) -> None:
+        zstd = _zstd()
+        self.directory = Path(directory)
+        self.index = pd.read_parquet(self.directory / INDEX_FILE)
+        self.meta = json.loads((self.directory / META_FILE).read_text())
+        dict_fp = self.directory / DICT_FILE
+        dictionary = zstd.ZstdCompressionDict(dict_fp.read_bytes()) if dict_fp.exists() else None
+        self._decompressor = zstd.ZstdDecompressor(dict_data=dictionary)
+        self._cache: OrderedDict[int, bytes] = OrderedDict()
+        self._cache_chunks = cache_chunks
+        self._pr_ids = self.index["pr_id"].to_numpy()
+
+    def chunk(self, chunk: int) -> bytes:
+        """Decompressed bytes of one chunk (small LRU cache)."""
+        if chunk in self._cache:
+            self._cache.move_to_end(chunk)
+            return self._cache[chunk]
+        data = self._decompressor.decompress(_chunk_path(self.directory, chunk).read_bytes())
+        self._cache[chunk] = data
+        if len(self._cache) > self._cache_chunks:
+            self._cache.popitem(last=False)
+        return data
+
+    def entries(self, pr_ids: Iterable | None = None) -> pd.DataFrame:
+        """Index rows for *pr_ids* (all rows when None), sorted by pr_id."""
+        if pr_ids is None:
+            return self.index
+        return self.index[self.index["pr_id"].isin(pd.Index(pr_ids))]
+
+    def get(self, pr_id, filename: str | None = None) -> pd.DataFrame:
+        """Patches of one PR (optionally one file) as (filename, sha, patch) rows."""
+        lo = np.searchsorted(self._pr_ids, pr_id, side="left")
+        hi = np.searchsorted(self._pr_ids, pr_id, side="right")
+        rows = self.index.iloc[lo:hi]
+        if filename is not None:
+            rows = rows[rows["filename"] == filename]
+        patches = [self.chunk(c)[o:o + n].decode() for c, o, n in
+                   zip(rows["chunk"], rows["offset"], rows["length"])]
+        return rows[["filename", "sha"]].assign(patch=patches).reset_index(drop=True)
+
+    def iter_chunks(self, pr_ids: Iterable | None = None) -> Iterator[tuple[bytes, pd.DataFrame]]:
+        """Yield (decompressed chunk, its selected index rows); each chunk is read once."""
+        rows = self.entries(pr_ids).sort_values(["chunk", "offset"], kind="stable")
+        for chunk, group in rows.groupby("chunk", sort=True):
+            yield self.chunk(int(chunk)), group
+
+    def iter_patches(self, pr_ids: Iterable | None = None) -> Iterator[tuple[object, str, str]]:
+        """Stream (pr_id, filename, patch) for the selected PRs."""
+        for data, group in self.iter_chunks(pr_ids):
+            for pr_id, filename, o, n in zip(group["pr_id"], group["filename"],
+                                             group["offset"], group["length"]):
+                yield pr_id, filename, data[o:o + n].decode()
+
+
+# =============================================================================
+# Vectorized diff statistics
+# =============================================================================
+_SPACE = np.zeros(256, dtype=bool)
+_SPACE[[ord(c) for c in " \t\r\n\f\v"]] = True
+
+
+def _chunk_diff_stats(data: bytes, offsets: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """(patches x 5) array of hunks, added/removed lines, added/removed tokens."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    out = np.zeros((offsets.size, 5), dtype=np.int64)
+    if buf.size == 0 or offsets.size == 0:
+        return out
+
+    # line starts: chunk start, every byte after '\n', and every patch start
+    starts = np.unique(np.r_[0, np.flatnonzero(buf == 10) + 1, offsets])
+    starts = starts[starts < buf.size]
+    ends = np.r_[starts[1:], buf.size]
+
+    # map each line to the selected patch containing it (-1 if none)
+    patch = np.searchsorted(offsets, starts, side="right") - 1
+    inside = (patch >= 0) & (starts < offsets[np.maximum(patch, 0)] + lengths[np.maximum(patch, 0)])
+    starts, ends, patch = starts[inside], ends[inside], patch[inside]
+    if starts.size == 0:
+        return out
+    # a patch's last line has no trailing '\n': stop it at the patch end, not
+    # at the start of the next (possibly unselected) patch
+    ends = np.minimum(ends, (offsets + lengths)[patch])
+
+    first = buf[starts]
+    second = buf[np.minimum(starts + 1, buf.size - 1)]
+    hunk = (first == ord("@")) & (second == ord("@")) & (ends - starts > 1)
+    added = first == ord("+")
+    removed = first == ord("-")
+
+    # tokens: runs of non-space bytes after the one-byte diff marker
+    word = ~_SPACE[buf]
+    line_body = np.zeros(buf.size, dtype=bool)
+    line_body[np.minimum(starts + 1, buf.size - 1)] = True
+    token_start = word & (np.r_[True, ~word[:-1]] | line_body)
+    token_start[starts] = False
+    cumulative = np.r_[0, np.cumsum(token_start)]
+    tokens = cumulative[ends] - cumulative[starts]
+
+    n = offsets.size
+    out[:, 0] = np.bincount(patch, weights=hunk, minlength=n)
+    out[:, 1] = np.bincount(patch, weights=added, minlength=n)
+    out[:, 2] = np.bincount(patch, weights=removed, minlength=n)
+    out[:, 3] = np.bincount(patch, weights=tokens * added, minlength=n)
+    out[:, 4] = np.bincount(patch, weights=tokens * removed, minlength=n)
+    return out
+
+
+DIFF_STAT_COLUMNS = ["hunks", "added_lines", "removed_lines", "added_tokens", "removed_tokens"]
+
+
+def diff_stats(store: PatchStore, pr_ids: Iterable | None = None) -> pd.DataFrame:
+    """Per-patch diff statistics for the selected PRs, one chunk at a time."""
+    frames = []
+    for data, group in store.iter_chunks(pr_ids):
+        stats = _chunk_diff_stats(data, group["offset"].to_numpy(), group["length"].to_numpy())
+        frames.append(pd.concat([group[["pr_id", "filename"]].reset_index(drop=True),
+                                 pd.DataFrame(stats, columns=DIFF_STAT_COLUMNS)], axis=1))
+    if not frames:
+        return pd.DataFrame(columns=["pr_id", "filename", *DIFF_STAT_COLUMNS])
+    return pd.concat(frames, ignore_index=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="write the store from pr_commit_details")
+    build.add_argument("--out", type=Path, default=Path("build/patches"))
+    build.add_argument("--chunk-bytes", type=int, default=1 << 20)
+    build.add_argument("--level", type=int, default=10)
+    build.add_argument("--dict", action="store_true", help="train a 112 KB shared dictionary")
+    stats = sub.add_parser("stats", help="diff statistics per PR")
+    stats.add_argument("--store", type=Path, default=Path("build/patches"))
+    stats.add_argument("--merged-only", action="store_true")
+    stats.add_argument("--out", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        frames = iter_batches(table_path("pr_commit_details"),
+                              columns=["pr_id", "sha", "filename", "patch"])
+        build_store(frames, args.out, chunk_bytes=args.chunk_bytes, level=args.level,
+                    dict_size=112_640 if args.dict else 0)
+        print("Wrote", args.out, json.loads((args.out / META_FILE).read_text()))
+        return
+
+    store = PatchStore(args.store)
+    pr_ids = None
+    if args.merged_only:
+        pr_df = load_table("pull_request", columns=["id", "merged_at"])
+        pr_ids = pr_df.loc[pr_df["merged_at"].notna(), "id"]
+    per_patch = diff_stats(store, pr_ids)
+    per_pr = per_patch.groupby("pr_id")[DIFF_STAT_COLUMNS].sum()
+    print(per_pr.describe().to_string())
+    if args.out:
+        per_pr.to_parquet(args.out)
+        print("Wrote", args.out)
+
+
+if __name__ == "__main__":
+    main()
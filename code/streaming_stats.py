@@ -0,0 +1,399 @@
+"""
+One-pass, mergeable summary statistics for the entity metrics in the report.
+
+The "Entity Summary Statistics" table and the appendix report mean, median,
+max, std, IQR, skewness and kurtosis for per-PR counts (commits, reviews,
+comments, files, lines, timeline events). `SummaryStatistics` produces the
+same numbers chunk by chunk:
+
+- moments are exact and merged with the pairwise update formulas of
+  Pébay (2008), so partial results from worker processes can be combined;
+- quantiles come from a KLL sketch (Karnin, Lang & Liberty, 2016) whose size
+  is bounded by its accuracy parameter `k`, not by the number of rows.
+
+Skewness and kurtosis use the same bias-corrected estimators as pandas
+(`Series.skew()` / `Series.kurt()`), so the streamed table matches the one
+computed from in-memory Series.
+
+Usage:
+    python streaming_stats.py
+    python streaming_stats.py --column all_repository.stars --column all_user.followers --processes 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from aidev_data import iter_batches, open_parquet, table_path
+
+# =============================================================================
+# Exact moments
+# =============================================================================
+class MomentAccumulator:
+    """Running count, mean, central moment sums (M2..M4), min and max."""
+
+    __slots__ = ("n", "mean", "m2", "m3", "m4", "min", "max")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> "MomentAccumulator":
+        acc = cls()
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return acc
+        acc.n = int(values.size)
+        acc.mean = float(values.mean())
+        dev = values - acc.mean
+        dev2 = dev * dev
+        acc.m2 = float(dev2.sum())
+        acc.m3 = float((dev2 * dev).sum())
+        acc.m4 = float((dev2 * dev2).sum())
+        acc.min = float(values.min())
+        acc.max = float(values.max())
+        return acc
+
+    def update(self, values: np.ndarray) -> "MomentAccumulator":
+        """Fold a chunk of finite values into the accumulator."""
+        return self.merge(MomentAccumulator.from_values(values))
+
+    def merge(self, other: "MomentAccumulator") -> "MomentAccumulator":
+        """Combine *other* into this accumulator in place and return self."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            for slot in self.__slots__:
+                setattr(self, slot, getattr(other, slot))
+            return self
+
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term = delta * delta_n * na * nb
+
+        m4 = (self.m4 + other.m4
+              + term * delta_n2 * (na * na - na * nb + nb * nb)
+              + 6.0 * delta_n2 * (na * na * other.m2 + nb * nb * self.m2)
+              + 4.0 * delta_n * (na * other.m3 - nb * self.m3))
+        m3 = (self.m3 + other.m3
+              + term * delta_n * (na - nb)
+              + 3.0 * delta_n * (na * other.m2 - nb * self.m2))
+        m2 = self.m2 + other.m2 + term
+
+        self.n = n
+        self.mean += delta_n * nb
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), as `pd.Series.var()`."""
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance) if self.n > 1 else math.nan
+
+    @property
+    def skewness(self) -> float:
+        """Adjusted Fisher-Pearson skewness, as `pd.Series.skew()`."""
+        n = self.n
+        if n < 3:
+            return math.nan
+        if self.m2 == 0:
+            return 0.0
+        g1 = math.sqrt(n) * self.m3 / self.m2 ** 1.5
+        return g1 * math.sqrt(n * (n - 1)) / (n - 2)
+
+    @property
+    def kurtosis(self) -> float:
+        """Unbiased excess kurtosis, as `pd.Series.kurt()`."""
+        n = self.n
+        if n < 4:
+            return math.nan
+        if self.m2 == 0:
+            return 0.0
+        adj = 3.0 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        return n * (n + 1) * (n - 1) * self.m4 / ((n - 2) * (n - 3) * self.m2 ** 2) - adj
+
+
+# =============================================================================
+# Approximate quantiles
+# =============================================================================
+class KLLSketch:
+    """
+    Mergeable quantile sketch with O(k) memory.
+
+    Items at level h carry weight 2**h. When a level exceeds its capacity it
+    is sorted and every other item (random offset) is promoted to the next
+    level. As long as nothing has been compacted the sketch holds the exact
+    values and `quantile` matches `np.quantile(..., method="inverted_cdf")`.
+    """
+
+    def __init__(self, k: int = 800, c: float = 2.0 / 3.0, seed: int | None = 0) -> None:
+        self.k = k
+        self.c = c
+        self.n = 0
+        self._levels: list[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * self.c ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items, kind="stable")
+                keep = items[-1:] if items.size % 2 else items[:0]
+                pairs = items[: items.size - keep.size]
+                offset = int(self._rng.integers(2))
+                self._levels[level] = keep.copy()
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], pairs[offset::2]])
+            level += 1
+
+    def update(self, values: np.ndarray) -> "KLLSketch":
+        """Add a chunk of finite values."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size:
+            self.n += int(values.size)
+            self._levels[0] = np.concatenate([self._levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Combine *other* into this sketch in place and return self."""
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    @property
+    def exact(self) -> bool:
+        return all(items.size == 0 for items in self._levels[1:])
+
+    def quantile(self, q: float | Sequence[float]) -> float | np.ndarray:
+        """
+        Approximate quantile(s) for q in [0, 1].
+
+        Both before and after compaction this is the inverted-CDF quantile:
+        the smallest value whose (weighted) rank reaches q * n. It does not
+        interpolate, so the median of an even count is the lower middle value.
+        """
+        q_arr = np.asarray(q, dtype=np.float64)
+        if self.n == 0:
+            out = np.full(q_arr.shape, np.nan)
+        elif self.exact:
+            out = np.quantile(self._levels[0], q_arr, method="inverted_cdf")
+        else:
+            values = np.concatenate(self._levels)
+            weights = np.concatenate([np.full(items.size, 2 ** level, dtype=np.float64)
+                                      for level, items in enumerate(self._levels)])
+            order = np.argsort(values, kind="stable")
+            values, cum = values[order], np.cumsum(weights[order])
+            out = values[np.minimum(np.searchsorted(cum, q_arr * cum[-1]), values.size - 1)]
+        return float(out) if out.ndim == 0 else out
+
+    def __len__(self) -> int:
+        return sum(items.size for items in self._levels)
+
+
+# =============================================================================
+# Combined summary
+# =============================================================================
+class SummaryStatistics:
+    """Moments plus quantile sketch; the unit that is updated, merged and reported."""
+
+    def __init__(self, k: int = 800, seed: int | None = 0) -> None:
+        self.moments = MomentAccumulator()
+        self.sketch = KLLSketch(k=k, seed=seed)
+
+    def update(self, values: Iterable[float] | pd.Series | np.ndarray) -> "SummaryStatistics":
+        """Add a chunk; NaN/inf values are ignored, as pandas does."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        self.moments.update(values)
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other: "SummaryStatistics") -> "SummaryStatistics":
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def to_dict(self) -> dict:
+        q1, median, q3 = (float(v) for v in self.sketch.quantile([0.25, 0.5, 0.75]))
+        m = self.moments
+        return {
+            "count": m.n,
+            "mean": m.mean if m.n else math.nan,
+            "median": median,
+            "min": m.min if m.n else math.nan,
+            "max": m.max if m.n else math.nan,
+            "std": m.std,
+            "iqr": q3 - q1,
+            "skewness": m.skewness,
+            "kurtosis": m.kurtosis,
+        }
+
+
+# =============================================================================
+# Streaming per-PR metrics
+# =============================================================================
+# label -> (table, value column or None for a row count)
+ENTITY_METRICS = {
+    "Commits per PR": ("pr_commits", None),
+    "Reviews per PR": ("pr_reviews", None),
+    "Comments per PR": ("pr_comments", None),
+    "Files Changed per PR": ("pr_commit_details", None),
+    "Lines Added per PR": ("pr_commit_details", "additions"),
+    "Lines Deleted per PR": ("pr_commit_details", "deletions"),
+    "Timeline Events per PR": ("pr_timeline", None),
+}
+
+
+def _row_group_splits(path: str, processes: int) -> list[list[int]]:
+    n_groups = open_parquet(path).num_row_groups
+    splits = [list(range(i, n_groups, processes)) for i in range(processes)]
+    return [s for s in splits if s]
+
+
+def _partial_group_totals(path: str, key: str, value: str | None,
+                          row_groups: list[int] | None, batch_size: int) -> pd.Series:
+    columns = [key] if value is None else [key, value]
+    totals = pd.Series(dtype=np.float64)
+    for chunk in iter_batches(path, columns=columns, batch_size=batch_size, row_groups=row_groups):
+        grouped = chunk.groupby(key).size() if value is None else chunk.groupby(key)[value].sum()
+        totals = totals.add(grouped.astype(np.float64), fill_value=0.0)
+    return totals
+
+
+def group_totals(path: str, key: str = "pr_id", value: str | None = None,
+                 processes: int = 1, batch_size: int = 65_536) -> pd.Series:
+    """
+    Per-key row counts (or sums of *value*) over a parquet file in bounded memory.
+
+    Only the running per-key totals are held, never the table itself. With
+    `processes > 1` row groups are split across worker processes and the
+    partial totals are added together.
+    """
+    if processes <= 1:
+        return _partial_group_totals(path, key, value, None, batch_size)
+    splits = _row_group_splits(path, processes)
+    with ProcessPoolExecutor(max_workers=len(splits)) as pool:
+        parts = pool.map(_partial_group_totals, [path] * len(splits), [key] * len(splits),
+                         [value] * len(splits), splits, [batch_size] * len(splits))
+        totals = pd.Series(dtype=np.float64)
+        for part in parts:
+            totals = totals.add(part, fill_value=0.0)
+    return totals
+
+
+def _partial_column_summary(path: str, column: str, row_groups: list[int] | None,
+                            batch_size: int, k: int) -> SummaryStatistics:
+    stats = SummaryStatistics(k=k)
+    for chunk in iter_batches(path, columns=[column], batch_size=batch_size, row_groups=row_groups):
+        stats.update(pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype=np.float64))
+    return stats
+
+
+def summarize_parquet_column(path: str, column: str, processes: int = 1,
+                             batch_size: int = 65_536, k: int = 800) -> SummaryStatistics:
+    """Summarize a numeric column row by row (e.g. per-file `additions`)."""
+    if processes <= 1:
+        return _partial_column_summary(path, column, None, batch_size, k)
+    splits = _row_group_splits(path, processes)
+    stats = SummaryStatistics(k=k)
+    with ProcessPoolExecutor(max_workers=len(splits)) as pool:
+        for part in pool.map(_partial_column_summary, [path] * len(splits), [column] * len(splits),
+                             splits, [batch_size] * len(splits), [k] * len(splits)):
+            stats.merge(part)
+    return stats
+
+
+def summarize_per_pr(totals: pd.Series, pr_ids: pd.Index | None = None,
+                     chunk_size: int = 1_000_000, k: int = 800) -> SummaryStatistics:
+    """
+    Summarize per-PR totals, counting PRs absent from *totals* as zero.
+
+    Passing *pr_ids* matters for sparse tables: a PR without comments has 0
+    comments, which moves the median and the moments.
+    """
+    if pr_ids is not None:
+        totals = totals.reindex(pr_ids, fill_value=0.0)
+    stats = SummaryStatistics(k=k)
+    values = totals.to_numpy(dtype=np.float64)
+    for start in range(0, values.size, chunk_size):
+        stats.update(values[start:start + chunk_size])
+    return stats
+
+
+def entity_summary_table(pr_table: str = "pull_request", *, processes: int = 1,
+                         base: str | None = None, k: int = 800) -> pd.DataFrame:
+    """
+    Build the entity summary statistics table from streamed tables.
+
+    Args:
+        pr_table: Table defining the PR universe; PRs it lists without child
+            rows count as zero.
+        processes: Worker processes per table scan.
+        base: Dataset location override (see `aidev_data.table_path`).
+        k: KLL accuracy parameter.
+    """
+    pr_ids = pd.Index(pd.concat([chunk["id"] for chunk in
+                                 iter_batches(table_path(pr_table, base), columns=["id"])]).unique())
+
+    cache: dict[tuple[str, str | None], pd.Series] = {}
+    rows = {}
+    for label, (table, value) in ENTITY_METRICS.items():
+        if (table, value) not in cache:
+            cache[(table, value)] = group_totals(table_path(table, base), "pr_id", value,
+                                                 processes=processes)
+        rows[label] = summarize_per_pr(cache[(table, value)], pr_ids, k=k).to_dict()
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pr-table", default="pull_request",
+                        help="table defining the PR universe (e.g. all_pull_request)")
+    parser.add_argument("--column", action="append", default=[], metavar="TABLE.COLUMN",
+                        help="also summarize a raw numeric column, e.g. all_repository.stars")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--k", type=int, default=800, help="KLL accuracy parameter")
+    args = parser.parse_args(argv)
+
+    table = entity_summary_table(args.pr_table, processes=args.processes, k=args.k)
+    for spec in args.column:
+        name, column = spec.split(".", 1)
+        stats = summarize_parquet_column(table_path(name), column, processes=args.processes, k=args.k)
+        table.loc[spec] = stats.to_dict()
+    print(table.to_string(float_format=lambda v: f"{v:,.2f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Per-PR lifecycle metrics from `pr_timeline`: time to first review,
+review -> merge latency, force pushes and close/reopen cycles.
+
+Events are reduced to three compact arrays (pr_id, int64 timestamp, int8
+event code), sorted once by (pr_id, created_at), and every metric is a
+segment-wise NumPy reduction over that order:
+
+- first / last occurrence of an event: `minimum.reduceat` / `maximum.reduceat`
+  over timestamps masked to that event;
+- occurrence counts: `add.reduceat` over the event mask;
+- "after X" conditions: the segment's X timestamp broadcast back to its
+  events with one `np.repeat`.
+
+No Python loop runs per PR, and the timeline is streamed in batches while
+loading, so the same code handles the full-scale timeline variants.
+
+Usage:
+    python timeline_analytics.py --out build/timeline.parquet
+    python timeline_analytics.py --table pr_timeline --pr-table pull_request
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aidev_data import iter_batches, load_table, table_path
+
+SECONDS_TO_HOUR = 3600
+
+# GitHub timeline event -> code; anything else is counted as "other"
+EVENT_CODES = {
+    "other": 0,
+    "committed": 1,
+    "head_ref_force_pushed": 2,
+    "review_requested": 3,
+    "reviewed": 4,
+    "commented": 5,
+    "closed": 6,
+    "reopened": 7,
+    "merged": 8,
+    "ready_for_review": 9,
+}
+
+_MAX = np.iinfo(np.int64).max
+_MIN = np.iinfo(np.int64).min
+
+
+def encode_events(frame: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(pr_id, ns timestamp with NaT as int64 min, event code) arrays of one batch."""
+    ts = pd.to_datetime(frame["created_at"], utc=True, errors="coerce")
+    codes = frame["event"].map(EVENT_CODES).fillna(0).to_numpy(dtype=np.int8)
+    return (frame["pr_id"].to_numpy(dtype=np.int64),
+            ts.to_numpy(dtype="datetime64[ns]").astype(np.int64), codes)
+
+
+def load_events(table: str = "pr_timeline", base: str | None = None,
+                batch_size: int = 1 << 20) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Stream *table* into the three event arrays without holding the full frame."""
+    parts = [encode_events(chunk) for chunk in
+             iter_batches(table_path(table, base), columns=["pr_id", "event", "created_at"],
+                          batch_size=batch_size)]
+    if not parts:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.int8)
+    return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+
+def lifecycle_metrics(pr_ids: np.ndarray, ts: np.ndarray, event: np.ndarray,
+                      pr_df: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Compute the per-PR lifecycle table from event arrays.
+
+    Args:
+        pr_ids, ts, event: Output of `load_events` / `encode_events`, in any order.
+        pr_df: Optional pull_request frame (`id`, `created_at`, optionally
+            `agent`). When given, latencies are measured from PR creation
+            (otherwise from the PR's first timeline event) and every PR gets a
+            row.
+
+    Returns:
+        DataFrame indexed by pr_id with int32 counts and float32 hour columns.
+    """
+    order = np.lexsort((ts, pr_ids))
+    pr_ids, ts, event = pr_ids[order], ts[order], event[order]
+    n = pr_ids.size
+    starts = np.flatnonzero(np.r_[True, pr_ids[1:] != pr_ids[:-1]]) if n else np.empty(0, np.int64)
+    sizes = np.diff(np.r_[starts, n])
+    timed = ts != _MIN  # NaT sorts first and is ignored by the time metrics
+
+    def count(mask: np.ndarray) -> np.ndarray:
+        return np.add.reduceat(mask.astype(np.int32), starts) if n else np.zeros(0, np.int32)
+
+    def first(mask: np.ndarray) -> np.ndarray:
+        return np.minimum.reduceat(np.where(mask & timed, ts, _MAX), starts) if n else np.zeros(0, np.int64)
+
+    def last(mask: np.ndarray) -> np.ndarray:
+        return np.maximum.reduceat(np.where(mask & timed, ts, _MIN), starts) if n else np.zeros(0, np.int64)
+
+    def per_event(values: np.ndarray) -> np.ndarray:
+        return np.repeat(values, sizes)
+
+    is_ = {name: event == code for name, code in EVENT_CODES.items()}
+    reviewed = is_["reviewed"]
+    merged_ts = first(is_["merged"])
+    first_review = first(reviewed)
+    last_review_before_merge = last(reviewed & (ts <= per_event(merged_ts)))
+    after_first_review = ts > per_event(first_review)
+
+    out = pd.DataFrame(index=pd.Index(pr_ids[starts], name="pr_id"))
+    out["events"] = sizes.astype(np.int32)
+    out["commits"] = count(is_["committed"])
+    out["force_pushes"] = count(is_["head_ref_force_pushed"])
+    out["review_requests"] = count(is_["review_requested"])
+    out["reviews"] = count(reviewed)
+    out["closes"] = count(is_["closed"])
+    out["reopens"] = count(is_["reopened"])
+    # rework: pushes landing after the first review
+    out["pushes_after_review"] = count((is_["committed"] | is_["head_ref_force_pushed"])
+                                       & after_first_review & timed)
+
+    def hours(later: np.ndarray, earlier: np.ndarray) -> np.ndarray:
+        valid = (later != _MAX) & (later != _MIN) & (earlier != _MAX) & (earlier != _MIN)
+        delta = (later - np.where(valid, earlier, later)) / 1e9 / SECONDS_TO_HOUR
+        return np.where(valid, delta, np.nan).astype(np.float32)
+
+    out["review_to_merge_hours"] = hours(merged_ts, last_review_before_merge)
+    out["first_review_to_merge_hours"] = hours(merged_ts, np.where(first_review <= merged_ts,
+                                                                   first_review, _MAX))
+    out["_first_review"] = first_review
+    out["_first_request"] = first(is_["review_requested"])
+    out["_merged"] = merged_ts
+    out["_start"] = first(np.ones(n, dtype=bool))
+
+    if pr_df is not None:
+        prs = pr_df.set_index("id")
+        # timestamps are reindexed on their own with an int64 fill: a NaN
+        # round-trip through float64 would turn _MAX into _MIN
+        time_cols = ["_first_review", "_first_request", "_merged"]
+        times = out[time_cols].reindex(prs.index.rename("pr_id"), fill_value=_MAX)
+        out = out.drop(columns=time_cols).reindex(prs.index.rename("pr_id"))
+        out[time_cols] = times
+        count_cols = ["events", "commits", "force_pushes", "review_requests", "reviews",
+                      "closes", "reopens", "pushes_after_review"]
+        out[count_cols] = out[count_cols].fillna(0).astype(np.int32)
+        created = pd.to_datetime(prs["created_at"], utc=True, errors="coerce")
+        out["_start"] = created.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        if "agent" in prs.columns:
+            out["agent"] = prs["agent"].astype("category")
+
+    start = out.pop("_start").to_numpy()
+    out["first_review_hours"] = hours(out.pop("_first_review").to_numpy(), start)
+    out["first_review_request_hours"] = hours(out.pop("_first_request").to_numpy(), start)
+    out["merge_hours"] = hours(out.pop("_merged").to_numpy(), start)
+    out["reopen_cycles"] = np.minimum(out["closes"], out["reopens"]).astype(np.int32)
+    return out
+
+
+def agent_summary(metrics: pd.DataFrame) -> pd.DataFrame:
+    """Median latencies and mean counts per agent."""
+    return metrics.groupby("agent", observed=True).agg(
+        prs=("events", "size"),
+        median_first_review_hours=("first_review_hours", "median"),
+        median_review_to_merge_hours=("review_to_merge_hours", "median"),
+        force_pushes_per_pr=("force_pushes", "mean"),
+        reopened_share=("reopens", lambda s: (s > 0).mean()),
+        pushes_after_review_per_pr=("pushes_after_review", "mean"),
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--table", default="pr_timeline")
+    parser.add_argument("--pr-table", default="pull_request")
+    parser.add_argument("--out", type=Path, help="write the per-PR table as parquet")
+    args = parser.parse_args(argv)
+
+    pr_ids, ts, event = load_events(args.table)
+    pr_df = load_table(args.pr_table, columns=["id", "agent", "created_at"])
+    metrics = lifecycle_metrics(pr_ids, ts, event, pr_df)
+    print(f"✓ {len(metrics):,} PRs, {pr_ids.size:,} timeline events")
+    print(agent_summary(metrics).to_string(float_format=lambda v: f"{v:.2f}"))
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        metrics.to_parquet(args.out)
+        print("Wrote", args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Issue <-> PR traceability index.
+
+A PR is linked to an issue by any of:
+- a `related_issue` row;
+- a mention in the PR body or in one of its commit messages: `#123` (an
+  issue of the PR's own repository), `owner/repo#123`, or an issue URL
+  (github.com/owner/repo/issues/123, api.github.com/repos/owner/repo/issues/123).
+Mentions after a closing keyword ("fixes #12") are flagged as closing.
+
+Mentions are resolved against the `issue` table with a sorted-key merge: both
+sides are encoded as one int64 key (repository code << 32 | issue number),
+the issue keys are sorted once and every mention is located with
+`np.searchsorted`. The result is kept as a CSR adjacency in both directions
+(PR -> issues with per-link kind bits, issue -> PRs) plus per-agent linked /
+unlinked totals, so "merge rate of issue-linked vs unlinked PRs per agent" is
+a lookup in the persisted index instead of a pass over the tables.
+
+Usage:
+    python traceability_index.py build
+    python traceability_index.py show --by mention
+    python traceability_index.py show --pr 3264016139
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from aidev_data import iter_batches, load_table, table_path
+
+INDEX_DIR = Path(__file__).resolve().parent.parent / "build" / "traceability"
+
+# link kind bits
+RELATED = 1   # related_issue row
+BODY = 2      # mentioned in the PR body
+COMMIT = 4    # mentioned in a commit message
+CLOSING = 8   # a mention preceded by a closing keyword
+
+# link class -> kind bits that count for it
+LINK_CLASSES = {
+    "any": RELATED | BODY | COMMIT,
+    "related_issue": RELATED,
+    "mention": BODY | COMMIT,
+    "closing": CLOSING,
+}
+
+MENTION_PATTERN = (
+    r"(?P<keyword>\b(?:close[sd]?|fix(?:e[sd])?|resolve[sd]?)\s*:?\s+)?"
+    r"(?:"
+    r"(?:https?://)?(?:www\.)?(?:github\.com/|api\.github\.com/repos/)"
+    r"(?P<url_repo>[\w.-]+/[\w.-]+)/issues/(?P<url_number>\d+)"
+    r"|(?<![\w&#/])(?P<repo>[\w.-]+/[\w.-]+)?#(?P<number>\d{1,9})\b"
+    r")"
+)
+
+_REPO_PREFIX = r"^(?:https?://)?(?:www\.)?(?:api\.)?github\.com/(?:repos/)?"
+
+
+def repo_name(urls: pd.Series) -> pd.Series:
+    """'owner/repo' (lower case) from repository, API or issue URLs."""
+    return (urls.astype(str).str.replace(_REPO_PREFIX, "", regex=True)
+            .str.extract(r"^([^/]+/[^/]+)", expand=False).str.lower())
+
+
+def extract_mentions(text: pd.Series, repos: pd.Series) -> pd.DataFrame:
+    """
+    Issue references in *text*, one row per mention.
+
+    Args:
+        text: PR bodies or commit messages.
+        repos: 'owner/repo' of the PR each text belongs to (same index), used
+            for bare `#123` mentions.
+
+    Returns:
+        Columns `row` (index label of the text), `repo`, `number` and `closing`.
+    """
+    found = text.dropna().astype(str).str.extractall(MENTION_PATTERN, flags=re.IGNORECASE)
+    if found.empty:
+        return pd.DataFrame({"row": pd.Series(dtype=text.index.dtype), "repo": pd.Series(dtype=object),
+                             "number": pd.Series(dtype=np.int64), "closing": pd.Series(dtype=bool)})
+    row = found.index.get_level_values(0)
+    repo = (found["url_repo"].fillna(found["repo"]).str.lower()
+            .fillna(pd.Series(repos.reindex(row).to_numpy(), index=found.index)))
+    number = found["url_number"].fillna(found["number"]).astype(np.int64)
+    return pd.DataFrame({"row": row, "repo": repo.to_numpy(), "number": number.to_numpy(),
+                         "closing": found["keyword"].notna().to_numpy()})
+
+
+def sorted_key_merge(left: np.ndarray, right: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Inner join of int64 keys, *right* unique.
+
+    Returns (left positions, right positions) of the matching pairs.
+    """
+    order = np.argsort(right, kind="stable")
+    ordered = right[order]
+    pos = np.searchsorted(ordered, left)
+    hit = pos < ordered.size
+    hit[hit] = ordered[pos[hit]] == left[hit]
+    return np.flatnonzero(hit), order[pos[hit]]
+
+
+def _csr(rows: np.ndarray, n: int) -> np.ndarray:
+    """Offsets of sorted row positions *rows* into n + 1 segment bounds."""
+    return np.searchsorted(rows, np.arange(n + 1)).astype(np.int64)
+
+
+class TraceabilityIndex:
+    """
+    PR <-> issue adjacency plus per-agent totals.
+
+    `pr_ids` and `issue_ids` are sorted; the links of PR `pr_ids[i]` are
+    `pr_issues[pr_offsets[i]:pr_offsets[i + 1]]` with kind bits in `pr_links`,
+    and the PRs of issue `issue_ids[j]` are
+    `issue_prs[issue_offsets[j]:issue_offsets[j + 1]]`.
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], stats: pd.DataFrame) -> None:
+        self.arrays = arrays
+        self.stats = stats
+        self._lookup = stats.set_index(["agent", "link_class", "linked"])
+
+    # --- construction --------------------------------------------------------
+    @classmethod
+    def from_frames(cls, pr_df: pd.DataFrame, issue_df: pd.DataFrame,
+                    related: pd.DataFrame | None = None,
+                    commits: Iterable[pd.DataFrame] = ()) -> "TraceabilityIndex":
+        """
+        Build the index from in-memory tables.
+
+        Args:
+            pr_df: `id`, `repo_url`, `agent`, `merged_at`, optionally `body`.
+            issue_df: `id`, `html_url`, optionally `number`.
+            related: `related_issue` rows (`pr_id`, `issue_id`).
+            commits: Chunks of `pr_commits` (`pr_id`, `message`).
+        """
+        pr_df = pr_df.drop_duplicates("id").sort_values("id", ignore_index=True)
+        pr_ids = pr_df["id"].to_numpy(dtype=np.int64)
+        pr_repo = repo_name(pr_df["repo_url"])
+
+        issue_df = issue_df.drop_duplicates("id")
+        issue_repo = repo_name(issue_df["html_url"])
+        if "number" in issue_df.columns:
+            issue_number = issue_df["number"]
+        else:
+            issue_number = issue_df["html_url"].astype(str).str.extract(r"/issues/(\d+)", expand=False)
+        issue_number = pd.to_numeric(issue_number, errors="coerce")
+
+        vocabulary = np.sort(pd.unique(pd.concat([pr_repo, issue_repo]).dropna().to_numpy(dtype=object)))
+
+        def keys(repo: pd.Series, number: pd.Series) -> np.ndarray:
+            code = pd.Index(vocabulary).get_indexer(repo.to_numpy(dtype=object)).astype(np.int64)
+            number = number.to_numpy(dtype=float)
+            valid = (code >= 0) & ~np.isnan(number) & (number >= 0) & (number < 2 ** 32)
+            return np.where(valid, code << 32 | np.nan_to_num(number).astype(np.int64), -1)
+
+        issue_keys = keys(issue_repo, issue_number)
+        valid = issue_keys >= 0
+        issue_keys = issue_keys[valid]
+        key_issue_ids = issue_df["id"].to_numpy(dtype=np.int64)[valid]
+        issue_keys, first = np.unique(issue_keys, return_index=True)
+        key_issue_ids = key_issue_ids[first]
+
+        pr_link, issue_link, kind = [], [], []
+
+        def add_mentions(mentions: pd.DataFrame, owner: np.ndarray, bit: int) -> None:
+            left, right = sorted_key_merge(keys(mentions["repo"], mentions["number"]), issue_keys)
+            pr_link.append(owner[left])
+            issue_link.append(key_issue_ids[right])
+            kind.append(np.where(mentions["closing"].to_numpy()[left], bit | CLOSING, bit)
+                        .astype(np.uint8))
+
+        if related is not None and len(related):
+            pr_link.append(related["pr_id"].to_numpy(dtype=np.int64))
+            issue_link.append(related["issue_id"].to_numpy(dtype=np.int64))
+            kind.append(np.full(len(related), RELATED, dtype=np.uint8))
+        if "body" in pr_df.columns:
+            mentions = extract_mentions(pr_df["body"], pr_repo)
+            add_mentions(mentions, pr_ids[mentions["row"].to_numpy(dtype=np.int64)], BODY)
+        repo_by_pr = pd.Series(pr_repo.to_numpy(), index=pr_ids)
+        for chunk in commits:
+            chunk = chunk.reset_index(drop=True)
+            owner = chunk["pr_id"].to_numpy(dtype=np.int64)
+            mentions = extract_mentions(chunk["message"], pd.Series(repo_by_pr.reindex(owner).to_numpy()))
+            add_mentions(mentions, owner[mentions["row"].to_numpy(dtype=np.int64)], COMMIT)
+
+        pr_col = np.concatenate(pr_link) if pr_link else np.empty(0, np.int64)
+        issue_col = np.concatenate(issue_link) if issue_link else np.empty(0, np.int64)
+        kinds = np.concatenate(kind) if kind else np.empty(0, np.uint8)
+        # drop links to PRs outside pr_df, then fold duplicate (pr, issue) pairs
+        known = np.isin(pr_col, pr_ids)
+        pr_col, issue_col, kinds = pr_col[known], issue_col[known], kinds[known]
+        order = np.lexsort((issue_col, pr_col))
+        pr_col, issue_col, kinds = pr_col[order], issue_col[order], kinds[order]
+        starts = np.flatnonzero(np.r_[True, (pr_col[1:] != pr_col[:-1])
+                                      | (issue_col[1:] != issue_col[:-1])]) if pr_col.size else order
+        if pr_col.size:
+            kinds = np.bitwise_or.reduceat(kinds, starts)
+        return cls._assemble(pr_df, pr_ids, np.searchsorted(pr_ids, pr_col[starts]),
+                             issue_col[starts], kinds)
+
+    @classmethod
+    def _assemble(cls, pr_df: pd.DataFrame, pr_ids: np.ndarray, link_pr: np.ndarray,
+                  issue_col: np.ndarray, kinds: np.ndarray) -> "TraceabilityIndex":
+        """Arrays and totals from links sorted by (PR position, issue id)."""
+        pr_offsets = _csr(link_pr, pr_ids.size)
+
+        issue_ids = np.unique(issue_col)
+        by_issue = np.lexsort((link_pr, issue_col))
+        issue_offsets = _csr(np.searchsorted(issue_ids, issue_col[by_issue]), issue_ids.size)
+
+        pr_kinds = np.zeros(pr_ids.size, dtype=np.uint8)
+        np.bitwise_or.at(pr_kinds, link_pr, kinds)
+        agents, agent_codes = np.unique(pr_df["agent"].astype(str).to_numpy(), return_inverse=True)
+        arrays = {
+            "pr_ids": pr_ids,
+            "pr_offsets": pr_offsets,
+            "pr_issues": issue_col,
+            "pr_links": kinds,
+            "issue_ids": issue_ids,
+            "issue_offsets": issue_offsets,
+            "issue_prs": pr_ids[link_pr[by_issue]],
+            "pr_kinds": pr_kinds,
+            "pr_agent": agent_codes.astype(np.int16),
+            "pr_merged": pr_df["merged_at"].notna().to_numpy(),
+            "agents": agents.astype(str),
+        }
+        return cls(arrays, link_stats(arrays))
+
+    @classmethod
+    def from_tables(cls, base: str | None = None) -> "TraceabilityIndex":
+        """Load the PR, issue and related_issue tables and stream the commit messages."""
+        pr_df = load_table("pull_request", columns=["id", "repo_url", "agent", "merged_at", "body"],
+                           base=base)
+        issue_df = load_table("issue", columns=["id", "number", "html_url"], base=base)
+        related = load_table("related_issue", columns=["pr_id", "issue_id"], base=base)
+        commits = iter_batches(table_path("pr_commits", base), columns=["pr_id", "message"])
+        return cls.from_frames(pr_df, issue_df, related, commits)
+
+    # --- lookups -------------------------------------------------------------
+    def issues_of(self, pr_id: int) -> pd.Series:
+        """Issue ids linked to *pr_id*, with their kind bits."""
+        a = self.arrays
+        i = np.searchsorted(a["pr_ids"], pr_id)
+        if i == a["pr_ids"].size or a["pr_ids"][i] != pr_id:
+            raise KeyError(pr_id)
+        lo, hi = a["pr_offsets"][i], a["pr_offsets"][i + 1]
+        return pd.Series(a["pr_links"][lo:hi], index=pd.Index(a["pr_issues"][lo:hi], name="issue_id"),
+                         name="kind")
+
+    def prs_of(self, issue_id: int) -> np.ndarray:
+        """PR ids linked to *issue_id* (empty if none)."""
+        a = self.arrays
+        j = np.searchsorted(a["issue_ids"], issue_id)
+        if j == a["issue_ids"].size or a["issue_ids"][j] != issue_id:
+            return np.empty(0, dtype=np.int64)
+        return a["issue_prs"][a["issue_offsets"][j]:a["issue_offsets"][j + 1]]
+
+    def merge_rate(self, agent: str = "all", link_class: str = "any") -> tuple[float, float]:
+        """(merge rate of linked PRs, of unlinked PRs) for *agent* ("all" for every agent)."""
+        rates = []
+        for linked in (True, False):
+            row = self._lookup.loc[(agent, link_class, linked)]
+            rates.append(float(row["merged"] / row["prs"]) if row["prs"] else float("nan"))
+        return rates[0], rates[1]
+
+    def summary(self, link_class: str = "any") -> pd.DataFrame:
+        """Per-agent PR counts and merge rates, linked vs unlinked."""
+        stats = self.stats[self.stats["link_class"] == link_class]
+        table = stats.pivot(index="agent", columns="linked", values=["prs", "merged"])
+        out = pd.DataFrame({
+            "linked_prs": table[("prs", True)],
+            "unlinked_prs": table[("prs", False)],
+            "linked_share": table[("prs", True)] / (table[("prs", True)] + table[("prs", False)]),
+            "linked_merge_rate": table[("merged", True)] / table[("prs", True)].replace(0, np.nan),
+            "unlinked_merge_rate": table[("merged", False)] / table[("prs", False)].replace(0, np.nan),
+        })
+        return out.loc[[a for a in out.index if a != "all"] + ["all"]]
+
+    # --- persistence ---------------------------------------------------------
+    def save(self, directory: str | Path = INDEX_DIR) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.savez(directory / "adjacency.npz", **self.arrays)
+        self.stats.to_parquet(directory / "stats.parquet", index=False)
+
+    @classmethod
+    def load(cls, directory: str | Path = INDEX_DIR) -> "TraceabilityIndex":
+        directory = Path(directory)
+        with np.load(directory / "adjacency.npz") as npz:
+            arrays = {name: npz[name] for name in npz.files}
+        return cls(arrays, pd.read_parquet(directory / "stats.parquet"))
+
+
+def link_stats(arrays: dict[str, np.ndarray]) -> pd.DataFrame:
+    """PRs and merged PRs per (agent, link class, linked), with "all" agents."""
+    agents = arrays["agents"]
+    codes = arrays["pr_agent"].astype(np.int64)
+    merged = arrays["pr_merged"].astype(np.int64)
+    rows = []
+    for link_class, bits in LINK_CLASSES.items():
+        linked = (arrays["pr_kinds"] & bits) != 0
+        for flag in (True, False):
+            mask = linked == flag
+            prs = np.bincount(codes[mask], minlength=agents.size)
+            done = np.bincount(codes[mask], weights=merged[mask], minlength=agents.size)
+            rows += [{"agent": str(a), "link_class": link_class, "linked": flag,
+                      "prs": int(p), "merged": int(m)} for a, p, m in zip(agents, prs, done)]
+            rows.append({"agent": "all", "link_class": link_class, "linked": flag,
+                         "prs": int(prs.sum()), "merged": int(done.sum())})
+    return pd.DataFrame(rows)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build")
+    build.add_argument("--base", help="snapshot location (default: AIDEV_DATA_DIR / Hugging Face)")
+    build.add_argument("--out", type=Path, default=INDEX_DIR)
+    show = sub.add_parser("show")
+    show.add_argument("--index", type=Path, default=INDEX_DIR)
+    show.add_argument("--by", choices=list(LINK_CLASSES), default="any",
+                      help="which links count as 'linked'")
+    show.add_argument("--pr", type=int, help="list the issues linked to this PR")
+    show.add_argument("--issue", type=int, help="list the PRs linked to this issue")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = TraceabilityIndex.from_tables(args.base)
+        index.save(args.out)
+        a = index.arrays
+        print(f"✓ {a['pr_issues'].size:,} links between {int((a['pr_kinds'] > 0).sum()):,} PRs "
+              f"and {a['issue_ids'].size:,} issues")
+        print("Wrote", args.out)
+        return
+    index = TraceabilityIndex.load(args.index)
+    if args.pr is not None:
+        print(index.issues_of(args.pr).to_string())
+    elif args.issue is not None:
+        print(index.prs_of(args.issue))
+    else:
+        print(index.summary(args.by).to_string(float_format=lambda v: f"{v:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
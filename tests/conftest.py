@@ -0,0 +1,30 @@
+"""Shared fixtures: the analysis modules live flat in code/."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "code"))
+
+import aidev_data  # noqa: E402
+
+
+@pytest.fixture
+def write_table(tmp_path, monkeypatch):
+    """Point the loaders at an empty local dataset; `write_table(name, frame)` adds a table."""
+    base = tmp_path / "data"
+    base.mkdir()
+    monkeypatch.setattr(aidev_data, "DATA_BASE", str(base))
+    monkeypatch.setattr(aidev_data, "SAMPLE", None)
+    monkeypatch.setattr(aidev_data, "COMPACT", False)
+
+    def write(name, frame):
+        path = base / f"{name}.parquet"
+        frame.to_parquet(path, index=False)
+        return path
+
+    write.base = base
+    return write
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from actor_index import ActorIndex
+
+CODE_DIR = Path(__file__).resolve().parent.parent / "code"
+
+
+def _index():
+    return ActorIndex.from_frames({
+        "pull_request": pd.DataFrame({"user": ["ann", "bob", "ann", None]}),
+        "pr_commits": pd.DataFrame({"author": ["ann", "cy"], "committer": ["web-flow", "cy"]}),
+        "pr_reviews": pd.DataFrame({"user": ["bob", "dee", "bob"]}),
+    })
+
+
+def test_role_counts_and_overlap():
+    index = _index()
+    counts = index.role_counts()
+    assert counts["PR Authors"] == 2
+    assert counts["Reviewers"] == 2
+    overlap = index.overlap_matrix()
+    assert overlap.loc["PR Authors", "Commit Authors"] == 1   # ann
+    assert overlap.loc["PR Authors", "Reviewers"] == 1        # bob
+    assert overlap.loc["Commit Authors", "Commit Committers"] == 1  # cy
+    assert (overlap.to_numpy().diagonal() == counts.to_numpy()).all()
+
+
+def test_encode_and_round_trip(tmp_path):
+    index = _index()
+    ids = index.encode(pd.Series(["bob", "zed"]))
+    assert ids[1] == -1 and index.decode(ids[:1])[0] == "bob"
+    index.save(tmp_path)
+    loaded = ActorIndex.load(tmp_path)
+    assert loaded.overlap_matrix().equals(index.overlap_matrix())
+
+
+def test_build_graph_does_not_import_pandas():
+    probe = ("import sys, build_report; build_report.default_nodes(); "
+             "print(sorted(m for m in ('pandas', 'numpy', 'pyarrow') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", probe], cwd=CODE_DIR, capture_output=True,
+                         text=True, check=True).stdout
+    assert out.strip() == "[]"
@@ -0,0 +1,107 @@
+import pandas as pd
+import pytest
+
+import build_report
+from build_report import (Node, ReportGraph, compute_vocab_metrics, default_nodes, latex_table,
+                          render_entity_counts, report_figures)
+
+
+def _graph(tmp_path, log, fail=()):
+    source = tmp_path / "input.csv"
+    if not source.exists():
+        source.write_text("a,b\n")
+    out = tmp_path / "table.tex"
+
+    def action(name):
+        def run():
+            log.append(name)
+            if name in fail:
+                raise RuntimeError("boom")
+            if name == "table":
+                out.write_text("x")
+        return run
+
+    nodes = [
+        Node("metrics", action("metrics"), sources=(str(source),)),
+        Node("other", action("other")),
+        Node("table", action("table"), deps=("metrics",), outputs=(out,)),
+        Node("pdf", action("pdf"), deps=("table", "other")),
+    ]
+    return ReportGraph(nodes, state_file=tmp_path / "state.json"), source, out
+
+
+def test_only_stale_nodes_rebuild(tmp_path):
+    log = []
+    graph, source, out = _graph(tmp_path, log)
+    assert graph.closure(["table"]) == ["metrics", "table"]
+    assert sorted(graph.build(jobs=2).ran) == ["metrics", "other", "pdf", "table"]
+
+    log.clear()
+    result = graph.build()
+    assert log == [] and sorted(result.skipped) == ["metrics", "other", "pdf", "table"]
+
+    source.write_text("a,b\n1,2\n")
+    graph, *_ = _graph(tmp_path, log)
+    graph.build()
+    assert log == ["metrics", "table", "pdf"]
+
+    log.clear()
+    out.unlink()  # a missing output reruns its node; its key is unchanged, so pdf is kept
+    graph.build()
+    assert log == ["table"]
+
+
+def test_failures_stop_dependents_only(tmp_path):
+    log = []
+    graph, *_ = _graph(tmp_path, log, fail=("metrics",))
+    result = graph.build()
+    assert set(result.failed) == {"metrics", "table", "pdf"}
+    assert result.ran == ["other"] and "table" not in log
+
+
+def test_graph_rejects_unknown_deps_and_cycles(tmp_path):
+    with pytest.raises(ValueError, match="unknown dependencies"):
+        ReportGraph([Node("a", lambda: None, deps=("b",))], state_file=tmp_path / "s.json")
+    graph = ReportGraph([Node("a", lambda: None, deps=("b",)), Node("b", lambda: None, deps=("a",))],
+                        state_file=tmp_path / "s.json")
+    with pytest.raises(ValueError, match="cycle"):
+        graph.closure(None)
+
+
+def test_rendered_table_layout():
+    tex = render_entity_counts({"Pull Requests": 1200, "Reviews": 34.4})
+    assert r"\label{tab:entity_counts}" in tex
+    assert r"Pull Requests & 1,200 \\" in tex
+    assert r"\textbf{Total Entities} & \textbf{1,234} \\" in tex
+    plain = latex_table("C", "tab:c", ["A"], [["1"]], column_format="l")
+    assert plain.index(r"\toprule") < plain.index(r"1 \\") < plain.index(r"\bottomrule")
+    assert r"\midrule" in plain and plain.count(r"\midrule") == 1
+
+
+def test_vocab_table_and_macros_are_generated(write_table, tmp_path, monkeypatch):
+    monkeypatch.setattr(build_report, "METRICS_DIR", tmp_path / "metrics")
+    monkeypatch.setattr(build_report, "TABLES_DIR", tmp_path / "tables")
+    write_table("pull_request", pd.DataFrame({"title": ["Fix bug", "fix Docs"], "body": [None, "the docs"]}))
+    write_table("pr_commits", pd.DataFrame({"message": ["fix"]}))
+    for name in ("pr_comments", "pr_reviews", "issue"):
+        write_table(name, pd.DataFrame({"title": ["x"], "body": pd.Series([None], dtype=object)}))
+    compute_vocab_metrics()
+    vocab = build_report._read_metrics("vocab")
+    assert vocab["PR Titles"] == 3 and vocab["PR Bodies"] == 2 and vocab["PR Comments"] == 0
+    assert vocab["Issue Titles"] == 1 and vocab["Total Unique Tokens"] == 5
+
+    build_report._write_metrics("code_metrics", {"Unique Files Modified": 196073})
+    monkeypatch.setattr(build_report, "TABLE_RENDERERS", {"vocab": build_report.render_vocab})
+    build_report.write_tables()
+    assert r"\textbf{Total Unique Tokens} & \textbf{5} \\" in (tmp_path / "tables" / "vocab.tex").read_text()
+    macros = (tmp_path / "tables" / "macros.tex").read_text()
+    assert r"\newcommand{\UniqueFilesModified}{196,073}" in macros
+
+
+def test_figure_nodes_declare_every_report_figure():
+    nodes = {node.name: node for node in default_nodes()}
+    declared = {p for name in ("individual_figures", "entity_figures") for p in nodes[name].outputs}
+    assert len(nodes["individual_figures"].outputs) == 30
+    assert set(report_figures("figures_individual")) <= declared
+    assert set(nodes["notebook_figures"].outputs) == set(report_figures("figures"))
+    assert "notebook_figures" in nodes["report"].deps
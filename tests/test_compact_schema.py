@@ -0,0 +1,82 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import aidev_data
+import compact_schema
+from compact_schema import MemoryBudget, MemoryBudgetWarning, compact, memory_report, parse_bytes
+
+PRS = pd.DataFrame({
+    "id": np.array([3_000_000_000, 3_000_000_001, 3_000_000_002], dtype=np.int64),
+    "number": [1, 2, 3],
+    "agent": ["Codex", "Codex", "Devin"],
+    "title": ["a", "b", "c"],
+    "created_at": ["2025-01-01T00:00:00Z", "2025-01-02T00:00:00Z", "2025-01-03T12:00:00Z"],
+    "stars": [1.0, np.nan, 3.0],
+    "score": [0.5, 0.25, 0.125],
+})
+
+
+def test_compact_changes_storage_not_values():
+    out = compact(PRS.rename(columns={"score": "extra"}), "pull_request")
+    assert out["id"].dtype == np.uint32
+    assert out["number"].dtype == np.int32
+    assert isinstance(out["agent"].dtype, pd.CategoricalDtype)
+    assert out["created_at"].dt.tz is not None
+    assert (out["id"].astype(np.int64) == PRS["id"]).all()
+    assert out["agent"].astype(str).tolist() == PRS["agent"].tolist()
+    assert out["extra"].dtype == np.float64  # undeclared non-integral floats are left alone
+
+
+def test_gaps_keep_counts_float64_and_narrow_ids():
+    out = compact(pd.DataFrame({"stars": [1.0, np.nan, 3.0], "id": [1.0, np.nan, 3.0]}), "repository")
+    assert out["stars"].dtype == np.float64 and out["id"].dtype == np.float32
+    additions = pd.DataFrame({"pr_id": [1, 1, 2], "additions": [2.0 ** 24, 1.0, np.nan]})
+    totals = compact(additions, "pr_commit_details").groupby("pr_id")["additions"].sum()
+    assert totals[1] == 2 ** 24 + 1
+
+
+def test_spill_streams_batches(tmp_path):
+    frame = compact(PRS, "pull_request")
+    out = compact_schema.spill(frame, tmp_path, "pull_request", batch_rows=2)
+    assert out["agent"].tolist() == PRS["agent"].tolist()
+    assert out["title"].tolist() == ["a", "b", "c"] and out["stars"].isna().tolist() == [False, True, False]
+    assert list(tmp_path.iterdir()) == []  # unlinked once mapped
+
+
+def test_parse_bytes():
+    assert parse_bytes("2GB") == 2 * 2 ** 30
+    assert parse_bytes("1.5 MiB") == int(1.5 * 2 ** 20)
+    assert parse_bytes("512") == 512
+    with pytest.raises(ValueError):
+        parse_bytes("lots")
+
+
+def test_budget_warns_then_spills(tmp_path):
+    frame = compact(PRS, "pull_request")
+    budget = MemoryBudget(limit=10)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        assert budget.admit("pull_request", frame) is frame
+    assert any(issubclass(w.category, MemoryBudgetWarning) for w in caught)
+
+    spilled = MemoryBudget(limit=10, action="spill", spill_dir=tmp_path).admit("pull_request", frame)
+    assert isinstance(spilled["number"].dtype, pd.ArrowDtype)
+    assert spilled["number"].tolist() == [1, 2, 3]
+    assert (spilled["agent"] == "Codex").sum() == 2
+
+
+def test_compact_is_opt_in(write_table, monkeypatch):
+    write_table("pull_request", PRS)
+    assert aidev_data.load_table("pull_request")["id"].dtype == np.int64
+    monkeypatch.setattr(aidev_data, "COMPACT", True)
+    monkeypatch.setattr(compact_schema, "BUDGET", None)
+    assert aidev_data.load_table("pull_request")["id"].dtype == np.uint32
+
+
+def test_memory_report(write_table):
+    write_table("pull_request", PRS)
+    report = memory_report(["pull_request"])
+    assert report.loc[0, "after"] < report.loc[0, "before"]
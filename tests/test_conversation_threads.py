@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conversation_threads import build_conversations, merge_rate_by_depth, stack_events
+
+PRS = pd.DataFrame({"id": [1, 2, 3], "agent": ["Codex", "Codex", "Devin"],
+                    "created_at": ["2025-01-01T00:00:00Z"] * 3,
+                    "merged_at": ["2025-01-03T00:00:00Z", None, "2025-01-02T00:00:00Z"]})
+
+
+def _tables():
+    comments = pd.DataFrame({"pr_id": [1, 1, 1, 2], "user": ["alice", "ci[bot]", "alice", "bob"],
+                             "user_type": ["User", "Bot", "User", "User"],
+                             "created_at": ["2025-01-01T01:00:00Z", "2025-01-01T02:00:00Z",
+                                            "2025-01-01T05:00:00Z", "2025-01-02T00:00:00Z"]})
+    reviews = pd.DataFrame({"pr_id": [1], "user": ["carol"], "submitted_at": ["2025-01-01T06:00:00Z"]})
+    return {"pr_comments": comments, "pr_reviews": reviews}
+
+
+def test_thread_measures():
+    out = build_conversations(stack_events(_tables()), PRS)
+    pr1 = out.loc[1]
+    assert (pr1["events"], pr1["comments"], pr1["reviews"]) == (4, 3, 1)
+    assert (pr1["bot_events"], pr1["participants"], pr1["turns"]) == (1, 3, 4)
+    assert pr1["human_bot_handoffs"] == 2
+    assert pr1["first_response_hours"] == pytest.approx(1.0)
+    assert pr1["bot_to_human_hours"] == pytest.approx(3.0)
+    assert out.loc[3, "events"] == 0 and out.loc[3, "depth_bucket"] == "none"
+
+
+def test_missing_logins_are_not_one_actor():
+    comments = pd.DataFrame({"pr_id": [1, 1, 1, 2], "user": ["alice", None, None, None],
+                             "created_at": ["2025-01-01T01:00:00Z", "2025-01-01T02:00:00Z",
+                                            "2025-01-01T03:00:00Z", "2025-01-01T04:00:00Z"]})
+    out = build_conversations(stack_events({"pr_comments": comments}), PRS)
+    assert out.loc[1, "events"] == 3 and out.loc[1, "participants"] == 1
+    assert out.loc[1, "turns"] == 1 and np.isnan(out.loc[1, "median_response_hours"])
+    assert out.loc[2, "events"] == 1 and out.loc[2, "participants"] == 0
+
+
+def test_empty_events_keep_the_schema():
+    events = stack_events({name: frame.iloc[:0] for name, frame in _tables().items()})
+    out = build_conversations(events, PRS)
+    full = build_conversations(stack_events(_tables()), PRS)
+    assert list(out.columns) == list(full.columns)
+    assert len(out) == 3 and (out["events"] == 0).all()
+    assert merge_rate_by_depth(out).loc["none", "prs"] == 3
+
+
+def test_merge_rate_needs_merge_outcome():
+    out = build_conversations(stack_events(_tables()))
+    with pytest.raises(ValueError, match="is_merged"):
+        merge_rate_by_depth(out)
+    rates = merge_rate_by_depth(build_conversations(stack_events(_tables()), PRS))
+    assert rates["prs"].sum() == 3
+    assert np.isclose(rates.loc["3-5", "merge_rate"], 1.0)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_server import AIDevServer, DataClient, preprocess
+
+
+def test_preprocess_keeps_missing_states():
+    df = preprocess(pd.DataFrame({
+        "state": ["OPEN", None, "Closed"], "agent": ["Codex", "Devin", "Codex"],
+        "type": [" fix", "feat ", "docs"], "created_at": ["2025-03-01T00:00:00Z", None, "bad"],
+    }))
+    assert df["state"].tolist()[0::2] == ["open", "closed"] and df["state"].isna()[1]
+    assert df["type"].tolist() == ["fix", "feat", "docs"]
+    assert isinstance(df["agent"].dtype, pd.CategoricalDtype)
+    assert str(df["created_at"].dt.tz) == "UTC" and df["created_at"].isna().sum() == 2
+
+
+@pytest.fixture
+def server(write_table):
+    write_table("pull_request", pd.DataFrame({
+        "id": [1, 2, 3, 4], "agent": ["Codex", "Devin", "Codex", "Devin"],
+        "state": ["CLOSED", "open", None, "open"], "repo_url": ["a", "b", "c", "gone"], "created_at": pd.Timestamp("2025-03-01", tz="UTC"),
+    }))
+    write_table("human_pull_request", pd.DataFrame({"id": [9], "agent": ["Human"], "state": ["closed"],
+                                                    "repo_url": ["a"]}))
+    write_table("repository", pd.DataFrame({"url": ["a", "b", "c"], "stars": [50, 100, 500],
+                                            "language": ["Go", "Python", "Go"]}))
+    write_table("pr_task_type", pd.DataFrame({"id": [1, 2, 3], "agent": ["Codex", "Devin", "Codex"],
+                                              "type": ["fix ", "feat", "docs"]}))
+    write_table("human_pr_task_type", pd.DataFrame({"id": [9], "agent": ["Human"], "type": ["fix"]}))
+    write_table("pr_commits", pd.DataFrame({"pr_id": [1, 1, 3], "sha": ["x", "y", "z"]}))
+    write_table("pr_comments", pd.DataFrame({"pr_id": [2], "body": ["hi"]}))
+    write_table("pr_reviews", pd.DataFrame({"pr_id": np.array([], dtype=np.int64)}))
+    write_table("pr_timeline", pd.DataFrame({"pr_id": [1, 2, 2], "event": ["committed"] * 3}))
+    write_table("pr_commit_details", pd.DataFrame({"pr_id": [1, 1], "additions": [3, 4],
+                                                   "deletions": [1, 0]}))
+    server = AIDevServer("grpc://127.0.0.1:0")
+    yield server
+    server.shutdown()
+
+
+def test_load_hf_data_matches_notebook(server):
+    client = DataClient(f"grpc://127.0.0.1:{server.port}")
+    data = client.load_hf_data(stars_range=[100, 500])
+    assert sorted(data.pr_df["id"]) == [2, 3, 9]
+    # labels are not narrowed to the star range, as in productivity.ipynb
+    assert sorted(data.lbl_df["id"]) == [1, 2, 3, 9]
+    assert data.lbl_df.set_index("id").loc[1, "type"] == "fix"
+    assert data.repo_df is not None and len(data.repo_df) == 3
+    # any star range, even an open one, drops PRs whose repository has no star count
+    assert sorted(client.load_hf_data(stars_range=[None, None]).pr_df["id"]) == [1, 2, 3, 9]
+    assert sorted(client.load_hf_data().pr_df["id"]) == [1, 2, 3, 4, 9]
+
+    prs = client.table("pull_request").set_index("id")
+    assert prs.loc[1, ["commits", "files_changed", "additions", "deletions"]].tolist() == [2, 2, 7, 1]
+    assert prs.loc[2, ["comments", "timeline_events", "repo_stars"]].tolist() == [1, 2, 100]
+    assert prs["state"].tolist()[:2] == ["closed", "open"] and pd.isna(prs.loc[3, "state"])
+    assert client.load_repo_meta("Codex")["url"].tolist() == ["a", "c"]
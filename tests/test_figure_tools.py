@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+import aidev_data
+import figure_tools
+from figure_tools import FigureRegistry
+
+CODE_DIR = Path(__file__).resolve().parent.parent / "code"
+
+
+def _registry(tmp_path):
+    script = tmp_path / "figs.py"
+    if not script.exists():
+        script.write_text("# figure script\n")
+    registry = FigureRegistry(str(script), data=dict, setup=lambda: None)
+
+    @registry.figure("01_prs", tables=("pull_request",), title="PRs")
+    def prs(data):
+        pass
+
+    @registry.figure("02_reviews", tables=("pr_reviews",))
+    def reviews(data):
+        """Reviews"""
+
+    return registry, script
+
+
+def _mark_rendered(registry, stamps):
+    registry.directory.mkdir(exist_ok=True)
+    for figure in registry.figures:
+        registry.path(figure).write_bytes(b"png")
+    registry.stamp_file.write_text(json.dumps(stamps))
+
+
+def test_stale_tracks_outputs_tables_and_code(tmp_path, monkeypatch, write_table):
+    monkeypatch.chdir(tmp_path)
+    write_table("pull_request", pd.DataFrame({"id": [1]}))
+    write_table("pr_reviews", pd.DataFrame({"pr_id": [1]}))
+    registry, script = _registry(tmp_path)
+    assert [f.title for f in registry.figures] == ["PRs", "Reviews"]
+
+    stale, stamps = registry.stale(registry.figures)
+    assert len(stale) == 2
+    _mark_rendered(registry, stamps)
+    assert registry.stale(registry.figures)[0] == []
+    assert registry.main(["--check"]) == 0
+
+    write_table("pr_reviews", pd.DataFrame({"pr_id": [1, 2, 3]}))
+    assert [f.name for f in registry.stale(registry.figures)[0]] == ["02_reviews"]
+    assert registry.main(["--check", "--only", "01"]) == 0
+    assert registry.main(["--check"]) == 1
+
+    script.write_text("# figure script, edited\n")
+    assert len(registry.stale(registry.figures)[0]) == 2
+
+
+def test_shared_modules_are_stamped(tmp_path, monkeypatch, write_table):
+    assert {"aidev_data.py", "compact_schema.py"} <= {p.name for p in figure_tools.SHARED_CODE}
+    monkeypatch.chdir(tmp_path)
+    write_table("pull_request", pd.DataFrame({"id": [1]}))
+    write_table("pr_reviews", pd.DataFrame({"pr_id": [1]}))
+    schema = tmp_path / "compact_schema.py"
+    schema.write_text("SCHEMA = {}\n")
+    monkeypatch.setattr(figure_tools, "SHARED_CODE", (schema,))
+    registry, _ = _registry(tmp_path)
+    _mark_rendered(registry, registry.stale(registry.figures)[1])
+    assert registry.stale(registry.figures)[0] == []
+    schema.write_text("SCHEMA = {'pull_request': {}}\n")
+    assert len(registry.stale(registry.figures)[0]) == 2
+
+
+def test_remote_fingerprints_are_cached(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(aidev_data, "_remote_fingerprint", lambda path: calls.append(path) or "v1")
+    monkeypatch.setattr(aidev_data, "FINGERPRINT_CACHE", tmp_path / "fingerprints.json")
+    path = "hf://datasets/x/pull_request.parquet"
+    assert aidev_data.source_fingerprint(path) == aidev_data.source_fingerprint(path) == "v1"
+    assert calls == [path]
+    monkeypatch.setattr(aidev_data, "FINGERPRINT_TTL", 0)
+    aidev_data.source_fingerprint(path)
+    assert calls == [path, path]
+
+
+def test_list_imports_no_heavy_modules():
+    code = ("import sys; import regenerate_individual_figures as r; r.registry.main(['--list']);"
+            "print(sorted(m for m in ('pandas', 'numpy', 'matplotlib') if m in sys.modules))")
+    env = {**os.environ, "AIDEV_DATA_DIR": "/nonexistent"}
+    out = subprocess.run([sys.executable, "-c", code], cwd=CODE_DIR, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip().splitlines()[-1] == "[]"
+    assert "pull_request" in out
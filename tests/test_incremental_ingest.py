@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import aidev_data
+from incremental_ingest import IngestState, diff_snapshots, ingest, key_frame, verify
+
+
+def _snapshot(n_prs=40, seed=0):
+    rng = np.random.default_rng(seed)
+    prs = pd.DataFrame({
+        "id": np.arange(n_prs), "agent": rng.choice(["Codex", "Devin"], n_prs),
+        "repo_url": "r", "user": "u", "state": "closed",
+        "created_at": "2025-01-01T00:00:00Z",
+        "merged_at": np.where(rng.random(n_prs) < 0.5, "2025-01-02T00:00:00Z", None),
+        "closed_at": "2025-01-02T00:00:00Z",
+    })
+    details = pd.DataFrame({"pr_id": rng.integers(0, n_prs, 200), "sha": "s",
+                            "filename": [f"f{i}" for i in range(200)],
+                            "additions": rng.integers(0, 50, 200), "deletions": rng.integers(0, 9, 200)})
+    comments = pd.DataFrame({"id": np.arange(100), "pr_id": rng.integers(0, n_prs, 100)})
+    # no id column: diffed as a multiset, with repeated rows
+    timeline = pd.DataFrame({"pr_id": rng.integers(0, 5, 80)})
+    empty = pd.DataFrame({"id": pd.Series(dtype="int64"), "pr_id": pd.Series(dtype="int64")})
+    return {"pull_request": prs, "pr_commit_details": details, "pr_comments": comments,
+            "pr_timeline": timeline, "pr_reviews": empty, "pr_review_comments": empty,
+            "pr_commits": pd.DataFrame({"pr_id": [0, 1], "sha": ["a", "b"]})}
+
+
+def _write(write_table, tables):
+    for name, frame in tables.items():
+        write_table(name, frame)
+
+
+def test_incremental_matches_full_rebuild(write_table, tmp_path):
+    tables = _snapshot()
+    _write(write_table, tables)
+    state = tmp_path / "state"
+    first = ingest(directory=state)
+    assert first["pull_request"]["inserted"] == 40
+
+    prs = tables["pull_request"]
+    prs.loc[3, "merged_at"] = "2025-02-01T00:00:00Z"
+    tables["pull_request"] = pd.concat([prs.drop(index=5), prs.iloc[[0]].assign(id=99)])
+    tables["pr_comments"] = tables["pr_comments"].iloc[10:]
+    _write(write_table, {k: tables[k] for k in ("pull_request", "pr_comments")})
+    second = ingest(directory=state)
+    assert set(second) == {"pull_request", "pr_comments"}
+    assert second["pr_comments"] == {"inserted": 0, "updated": 0, "deleted": 10}
+    assert verify(directory=state)
+
+
+def test_duplicates_do_not_rekey_unrelated_rows():
+    timeline = pd.DataFrame({"pr_id": [1, 2, 3, 4]})
+    old = key_frame("pr_timeline", timeline, [], ["pr_id"])
+    new = key_frame("pr_timeline", pd.concat([timeline, timeline.iloc[[0]]]), [], ["pr_id"])
+    assert (new["_key"].iloc[:4].to_numpy() == old["_key"].to_numpy()).all()
+    delta = diff_snapshots("pr_timeline", old, new)
+    assert (delta.inserted, delta.updated, delta.deleted) == (1, 0, 0)
+
+
+def test_state_ignores_preview_sampling(write_table, tmp_path, monkeypatch):
+    _write(write_table, _snapshot())
+    monkeypatch.setattr(aidev_data, "SAMPLE", aidev_data.SampleSpec(0.25))
+    monkeypatch.setattr(aidev_data, "COMPACT", True)
+    ingest(directory=tmp_path / "state")
+    monkeypatch.setattr(aidev_data, "SAMPLE", None)
+    assert len(IngestState.load(tmp_path / "state").pr_metrics()) == 40
+    assert not ingest(directory=tmp_path / "state")  # same fingerprints: nothing to do
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_first_ingest_totals(write_table, tmp_path, seed):
+    tables = _snapshot(seed=seed)
+    _write(write_table, tables)
+    ingest(directory=tmp_path / "state")
+    totals = IngestState.load(tmp_path / "state").aggregates
+    details = tables["pr_commit_details"].merge(tables["pull_request"], left_on="pr_id", right_on="id")
+    assert totals["additions"].to_dict() == details.groupby("agent")["additions"].sum().to_dict()
+    assert totals["prs"].sum() == 40
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from learning_curves import ORDINAL_LABELS, add_ordinals, learning_curves
+
+
+def _prs(n=300, seed=5):
+    rng = np.random.default_rng(seed)
+    created = pd.Timestamp("2025-01-01", tz="UTC") + pd.to_timedelta(rng.integers(0, 10**6, n), unit="min")
+    repo = rng.choice(["r1", "r2", "r3", "r4", None], n)
+    return pd.DataFrame({
+        "id": np.arange(n), "agent": rng.choice(["Codex", "Devin"], n), "repo_url": repo,
+        "created_at": created,
+        "merged_at": np.where(rng.random(n) < 0.6, created + pd.Timedelta(hours=1), pd.NaT),
+    })
+
+
+def test_ordinals_match_a_per_group_loop():
+    prs = _prs()
+    out = add_ordinals(prs, window=3)
+    assert len(out) == prs["repo_url"].notna().sum()
+    for _, group in out.groupby(["agent", "repo_url"]):
+        merged = group["is_merged"].to_numpy()
+        assert (group["ordinal"].to_numpy() == np.arange(1, len(group) + 1)).all()
+        assert group["created_at"].is_monotonic_increasing
+        expanding = np.cumsum(merged) / np.arange(1, len(group) + 1)
+        rolling = pd.Series(merged, dtype=float).rolling(3, min_periods=1).mean().to_numpy()
+        np.testing.assert_allclose(group["expanding_merge_rate"], expanding, rtol=1e-6)
+        np.testing.assert_allclose(group["rolling_merge_rate"], rolling, rtol=1e-6)
+
+
+def test_curves_skip_prs_without_repository():
+    prs = _prs()
+    curves = learning_curves(prs, replicates=50)
+    assert list(curves["ordinal_bin"][:len(ORDINAL_LABELS)]) == ORDINAL_LABELS
+    known = add_ordinals(prs)
+    expected = known.groupby(["agent", "ordinal_bin"], observed=False)["is_merged"].agg(["size", "mean"])
+    got = curves.set_index(["agent", "ordinal_bin"])
+    for (agent, label), row in expected.iterrows():
+        assert got.loc[(agent, label), "prs"] == row["size"]
+        if row["size"]:
+            assert np.isclose(got.loc[(agent, label), "merge_rate"], row["mean"])
+            assert got.loc[(agent, label), "ci_low"] <= row["mean"] <= got.loc[(agent, label), "ci_high"]
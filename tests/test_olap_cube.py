@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from olap_cube import MEASURES, Cube, build_cube, pr_facts
+
+
+def _facts():
+    rng = np.random.default_rng(3)
+    n = 200
+    facts = pd.DataFrame({
+        "agent": rng.choice(["Codex", "Devin", "Copilot"], n),
+        "task_type": rng.choice(["feat", "fix", "docs"], n),
+        "month": rng.choice(["2025-01", "2025-02", "2025-03", "2025-04", "unknown"], n),
+        "language": rng.choice(["Python", "Go"], n),
+        "star_band": rng.choice(["<10", "100-499", "5k+", "unknown"], n),
+    })
+    for measure in MEASURES:
+        facts[measure] = rng.integers(0, 5, n)
+    facts["prs"] = 1
+    return facts
+
+
+def test_rollup_matches_facts():
+    facts = _facts()
+    cube = Cube(build_cube(facts))
+    got = cube.query(["agent", "month"], measures=["prs", "additions"], ratios=False)
+    expected = facts.groupby(["agent", "month"])[["prs", "additions"]].sum()
+    pd.testing.assert_frame_equal(got.reset_index().astype({"agent": str, "month": str}),
+                                  expected.reset_index(), check_dtype=False)
+
+
+def test_between_accepts_non_member_bounds():
+    facts = _facts()
+    cube = Cube(build_cube(facts))
+    got = cube.query(between={"month": ("2025-01-15", "2025-03-31")}, measures=["prs"], ratios=False)
+    assert got["prs"].iloc[0] == facts["month"].isin(["2025-02", "2025-03"]).sum()
+
+    open_ended = cube.query(between={"month": ("2025-03", None)}, measures=["prs"], ratios=False)
+    assert open_ended["prs"].iloc[0] == facts["month"].isin(["2025-03", "2025-04"]).sum()
+
+
+def test_between_star_bands_needs_members():
+    facts = _facts()
+    cube = Cube(build_cube(facts))
+    got = cube.query(between={"star_band": ("<10", "100-499")}, measures=["prs"], ratios=False)
+    assert got["prs"].iloc[0] == facts["star_band"].isin(["<10", "100-499"]).sum()
+    with pytest.raises(ValueError, match="not a star_band member"):
+        cube.query(between={"star_band": ("50", None)})
+
+
+def test_star_bands_are_half_open():
+    pr_metrics = pd.DataFrame({
+        "pr_id": [1, 2, 3], "agent": "Codex", "state": "closed",
+        "created_at": pd.Timestamp("2025-03-01", tz="UTC"),
+        "merged_at": pd.Timestamp("2025-03-02", tz="UTC"), "closed_at": pd.NaT,
+        "repo_url": ["a", "b", "c"],
+        **{m: 0 for m in ("additions", "deletions", "files_changed", "commits",
+                          "comments", "reviews", "review_comments")},
+    })
+    repos = pd.DataFrame({"url": ["a", "b", "c"], "language": "Go", "stars": [499, 500, 1000]})
+    labels = pd.DataFrame({"id": [1], "type": [" fix "]})
+    facts = pr_facts(pr_metrics, labels, repos)
+    assert facts["star_band"].astype(str).tolist() == ["100-499", "500-999", "1k-5k"]
+    assert facts["task_type"].tolist() == ["fix", "unlabeled", "unlabeled"]
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("zstandard")
+
+from patch_store import DICT_FILE, PatchStore, build_store, diff_stats  # noqa: E402
+
+PATCHES = pd.DataFrame({
+    "pr_id": [1, 2, 3, 3],
+    "sha": ["a", "b", "c", "c"],
+    "filename": ["x.py", "y.py", "z.py", "w.py"],
+    # no trailing newline: the last line must not run into the next patch
+    "patch": ["@@ -1 +1 @@\n-old line\n+new a b",
+              "@@ -0,0 +1 @@\n+one two three",
+              "@@ -2,2 +2,2 @@\n context\n-gone\n+kept here",
+              None],
+})
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PatchStore(build_store([PATCHES], tmp_path / "store", chunk_bytes=1 << 20))
+
+
+def test_get_round_trips_patches(store):
+    got = store.get(3)
+    assert got["patch"].tolist() == [PATCHES["patch"][2]]
+    assert store.get(99).empty
+
+
+def test_diff_stats_counts_lines_and_tokens(store):
+    stats = diff_stats(store).set_index("pr_id")
+    assert stats.loc[1, ["hunks", "added_lines", "removed_lines"]].tolist() == [1, 1, 1]
+    assert stats.loc[1, "added_tokens"] == 3
+    assert stats.loc[1, "removed_tokens"] == 2
+    assert stats.loc[2, "added_tokens"] == 3
+
+
+@pytest.mark.parametrize("subset", [[1], [1, 3], [2], [3, 1]])
+def test_subset_stats_match_unfiltered(store, subset):
+    full = diff_stats(store).set_index(["pr_id", "filename"]).sort_index()
+    part = diff_stats(store, subset).set_index(["pr_id", "filename"]).sort_index()
+    assert part.equals(full.loc[part.index])
+    assert set(part.index.get_level_values("pr_id")) == set(subset)
+
+
+def test_dictionary_build_without_patches(tmp_path):
+    empty = PATCHES.assign(patch=None)
+    directory = build_store([empty], tmp_path / "store", dict_size=4096)
+    assert not (directory / DICT_FILE).exists()
+    assert PatchStore(directory).index.empty
+
+
+def test_dictionary_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    words = np.array(["def", "return", "import", "self", "value", "+", "-", "@@"])
+    frame = pd.DataFrame({
+        "pr_id": np.arange(400), "filename": "f.py",
+        "patch": [" ".join(rng.choice(words, 40)) + "\n+x" for _ in range(400)],
+    })
+    store = PatchStore(build_store([frame], tmp_path / "store", chunk_bytes=4096, dict_size=2048,
+                                   dict_samples=400))
+    assert store.get(17)["patch"][0] == frame["patch"][17]
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import aidev_data
+from aidev_data import SampleSpec, load_table, stratified_sample
+
+
+@pytest.fixture
+def sampled_tables(write_table, monkeypatch):
+    rng = np.random.default_rng(7)
+    n = 1000
+    prs = pd.DataFrame({
+        "id": np.arange(100, 100 + n), "agent": rng.choice(["Codex", "Devin", "Cursor"], n, p=[.7, .2, .1]),
+        "repo_url": rng.choice([f"r{i}" for i in range(40)], n), "user": rng.choice(["a", "b", "c"], n),
+    })
+    write_table("pull_request", prs)
+    write_table("pr_comments", pd.DataFrame({"pr_id": np.repeat(prs["id"], 2), "body": "x"}))
+    write_table("related_issue", pd.DataFrame({"pr_id": prs["id"][::4], "issue_id": prs["id"][::4] * 10}))
+    write_table("issue", pd.DataFrame({"id": np.arange(0, 20_000, 5), "title": "t"}))
+    write_table("repository", pd.DataFrame({"url": [f"r{i}" for i in range(60)], "stars": 1}))
+    aidev_data._sample_values.cache_clear()
+    aidev_data._schema_names.cache_clear()
+    yield prs
+    aidev_data._sample_values.cache_clear()
+    aidev_data._schema_names.cache_clear()
+
+
+def test_quotas_are_exact_per_agent(sampled_tables):
+    prs = sampled_tables
+    for spec in (SampleSpec(0.1), SampleSpec(0.1, spread="repo_url", seed=3)):
+        mask = stratified_sample(prs, spec)
+        got = prs[mask.to_numpy()].groupby("agent").size()
+        expected = np.rint(prs.groupby("agent").size() * 0.1).astype(int)
+        pd.testing.assert_series_equal(got, expected, check_dtype=False)
+    assert stratified_sample(prs, SampleSpec(0.1)).equals(stratified_sample(prs, SampleSpec(0.1)))
+    assert not stratified_sample(prs, SampleSpec(0.1)).equals(stratified_sample(prs, SampleSpec(0.1, seed=1)))
+
+
+def test_loaders_follow_foreign_keys(sampled_tables, monkeypatch):
+    monkeypatch.setattr(aidev_data, "SAMPLE", SampleSpec(0.2))
+    prs = load_table("pull_request")
+    assert len(prs) == 200
+    comments = load_table("pr_comments", columns=["pr_id"])
+    assert set(comments["pr_id"]) == set(prs["id"]) and len(comments) == 400
+    links = load_table("related_issue")
+    assert set(links["pr_id"]) <= set(prs["id"])
+    assert set(load_table("issue")["id"]) == set(links["issue_id"])
+    assert set(load_table("repository")["url"]) == set(prs["repo_url"])
+
+    monkeypatch.setattr(aidev_data, "SAMPLE", None)
+    assert len(load_table("pull_request")) == 1000
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming_stats import (KLLSketch, MomentAccumulator, SummaryStatistics, group_totals,
+                             summarize_per_pr)
+
+
+def test_merged_moments_match_pandas():
+    values = np.random.default_rng(0).lognormal(2.0, 1.0, 10_000)
+    acc = MomentAccumulator()
+    for chunk in np.array_split(values, 7):
+        acc.merge(MomentAccumulator.from_values(chunk))
+    series = pd.Series(values)
+    assert acc.n == values.size
+    assert acc.mean == pytest.approx(series.mean())
+    assert acc.variance == pytest.approx(series.var())
+    assert acc.skewness == pytest.approx(series.skew())
+    assert acc.kurtosis == pytest.approx(series.kurt())
+    assert (acc.min, acc.max) == (values.min(), values.max())
+
+
+def test_kll_quantiles_within_rank_error():
+    values = np.random.default_rng(1).exponential(10.0, 200_000)
+    sketch = KLLSketch(k=400)
+    for chunk in np.array_split(values, 20):
+        sketch.update(chunk)
+    assert not sketch.exact and len(sketch) < values.size // 10
+    ordered = np.sort(values)
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        rank = np.searchsorted(ordered, sketch.quantile(q)) / values.size
+        assert abs(rank - q) < 0.01
+
+
+def test_small_sketch_is_exact_and_ignores_non_finite():
+    stats = SummaryStatistics().update([1.0, 2.0, np.nan, 3.0, np.inf, 10.0])
+    summary = stats.to_dict()
+    assert summary["count"] == 4 and summary["median"] == 2.0
+    assert summary["iqr"] == 2.0
+
+
+def test_quantile_rule_survives_compaction():
+    values = np.array([10, 3, 1, 2, 2, 3, 1, 10], dtype=float)  # pairs compact losslessly
+    sketch = KLLSketch(k=6).update(values)
+    assert not sketch.exact
+    q = np.linspace(0, 1, 21)
+    np.testing.assert_array_equal(sketch.quantile(q), np.quantile(values, q, method="inverted_cdf"))
+
+
+def test_per_pr_totals_count_missing_prs_as_zero(tmp_path):
+    path = tmp_path / "pr_commit_details.parquet"
+    pd.DataFrame({"pr_id": [1, 1, 2, 4, 4, 4], "additions": [1, 2, 3, 4, 5, 6]}).to_parquet(
+        path, index=False, row_group_size=2)
+    assert group_totals(str(path), value="additions", batch_size=2).to_dict() == {1: 3, 2: 3, 4: 15}
+    counts = group_totals(str(path), batch_size=2)
+    summary = summarize_per_pr(counts, pd.Index([1, 2, 3, 4])).to_dict()
+    assert summary["count"] == 4 and summary["mean"] == 1.5 and summary["median"] == 1.0
@@ -0,0 +1,50 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from timeline_analytics import agent_summary, encode_events, lifecycle_metrics
+
+T0 = pd.Timestamp("2025-03-01", tz="UTC")
+
+
+def _timeline():
+    rows = [
+        (1, "committed", 1), (1, "review_requested", 2), (1, "reviewed", 4),
+        (1, "committed", 5), (1, "reviewed", 6), (1, "merged", 8),
+        (2, "committed", 1), (2, "closed", 3), (2, "reopened", 4), (2, "head_ref_force_pushed", 5),
+        (2, "mystery_event", 6),
+    ]
+    frame = pd.DataFrame(rows, columns=["pr_id", "event", "hours"])
+    frame["created_at"] = T0 + pd.to_timedelta(frame.pop("hours"), unit="h")
+    return frame.sample(frac=1, random_state=0)  # any order in
+
+
+def test_lifecycle_metrics_match_hand_counts():
+    metrics = lifecycle_metrics(*encode_events(_timeline()))
+    one, two = metrics.loc[1], metrics.loc[2]
+    assert one["events"] == 6 and one["reviews"] == 2 and one["commits"] == 2
+    assert one["pushes_after_review"] == 1
+    assert one["review_to_merge_hours"] == 2 and one["first_review_to_merge_hours"] == 4
+    # without pr_df, latencies start at the first timeline event
+    assert one["first_review_hours"] == 3 and one["merge_hours"] == 7
+    assert two["reopen_cycles"] == 1 and two["force_pushes"] == 1 and two["events"] == 5
+    assert np.isnan(two["merge_hours"]) and np.isnan(two["first_review_hours"])
+
+
+def test_prs_without_events_get_empty_latencies():
+    pr_df = pd.DataFrame({"id": [1, 2, 3], "agent": ["Codex", "Devin", "Devin"],
+                          "created_at": [T0, T0, T0]})
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        metrics = lifecycle_metrics(*encode_events(_timeline()), pr_df)
+    assert list(metrics.index) == [1, 2, 3]
+    silent = metrics.loc[3]
+    assert silent["events"] == 0 and silent["reviews"] == 0
+    assert np.isnan(silent[["first_review_hours", "first_review_request_hours",
+                            "merge_hours"]].astype(float)).all()
+    assert metrics.loc[1, "merge_hours"] == 8 and metrics.loc[1, "first_review_request_hours"] == 2
+
+    summary = agent_summary(metrics)
+    assert summary.loc["Devin", "prs"] == 2
+    assert summary.loc["Devin", "reopened_share"] == 0.5
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from traceability_index import BODY, CLOSING, COMMIT, RELATED, TraceabilityIndex, extract_mentions
+
+
+def _index():
+    pr_df = pd.DataFrame({
+        "id": [30, 10, 20, 40],
+        "repo_url": ["https://api.github.com/repos/Acme/App", "https://github.com/acme/app",
+                     "https://github.com/other/lib", "https://github.com/acme/app"],
+        "agent": ["Codex", "Codex", "Devin", "Devin"],
+        "merged_at": [pd.Timestamp("2025-03-01"), None, pd.Timestamp("2025-03-02"), None],
+        "body": ["Fixes #1 and see other/lib#7", None,
+                 "see https://github.com/acme/app/issues/2", "unrelated &#1; text"],
+    })
+    issue_df = pd.DataFrame({
+        "id": [101, 102, 107, 109],
+        "html_url": ["https://github.com/acme/app/issues/1", "https://github.com/acme/app/issues/2",
+                     "https://github.com/other/lib/issues/7", "https://github.com/other/lib/issues/9"],
+    })
+    related = pd.DataFrame({"pr_id": [10, 30, 999], "issue_id": [102, 101, 101]})
+    commits = [pd.DataFrame({"pr_id": [20, 20], "message": ["closes #9", "wip"]})]
+    return TraceabilityIndex.from_frames(pr_df, issue_df, related, commits)
+
+
+def test_extract_mentions_forms():
+    text = pd.Series(["Resolves: #12, owner/Repo#3", "https://github.com/a/b/issues/5 and a#4"])
+    found = extract_mentions(text, pd.Series(["me/mine", "me/mine"]))
+    assert found[["row", "repo", "number", "closing"]].values.tolist() == [
+        [0, "me/mine", 12, True], [0, "owner/repo", 3, False], [1, "a/b", 5, False]]
+
+
+def test_links_and_lookups():
+    index = _index()
+    pr30 = index.issues_of(30)
+    assert pr30.to_dict() == {101: RELATED | BODY | CLOSING, 107: BODY}
+    assert index.issues_of(10).to_dict() == {102: RELATED}
+    assert index.issues_of(20).to_dict() == {102: BODY, 109: COMMIT | CLOSING}
+    assert index.issues_of(40).empty
+    assert list(index.prs_of(102)) == [10, 20] and list(index.prs_of(101)) == [30]
+    assert index.prs_of(555).size == 0
+    with pytest.raises(KeyError):
+        index.issues_of(999)
+
+
+def test_merge_rates_and_round_trip(tmp_path):
+    index = _index()
+    assert index.merge_rate() == (2 / 3, 0.0)
+    assert index.merge_rate("Devin", "closing") == (1.0, 0.0)
+    assert index.merge_rate("Codex", "mention") == (1.0, 0.0)
+    summary = index.summary()
+    assert list(summary.index) == ["Codex", "Devin", "all"]
+    assert summary.loc["all", "linked_prs"] == 3
+
+    index.save(tmp_path)
+    loaded = TraceabilityIndex.load(tmp_path)
+    assert loaded.issues_of(20).to_dict() == index.issues_of(20).to_dict()
+    pd.testing.assert_frame_equal(loaded.summary(), summary)